@@ -1,32 +1,113 @@
-import logging
+import hashlib
 import os
 from datetime import timedelta
+from functools import lru_cache
 
-from flask import Flask, jsonify, request, send_from_directory
-from flask_cors import CORS
-from flask_jwt_extended import JWTManager
+import orjson
+import sentry_sdk
+from flask import Flask, Response, jsonify, request, send_from_directory
+from werkzeug.exceptions import HTTPException
 
+from app.auth_cache import CachingJWTManager
 from app.database import DatabaseManager
-from app.logger import logger
-from app.middleware import log_request, log_response
+from app.json_provider import OrjsonProvider
+from app.logger import configure_root_logger, logger
+from app.middleware import compress_response, log_request, log_response
 from app.swagger import API_URL, SWAGGER_URL, spec, swagger_ui_blueprint
 
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+# The CORS policy allows every origin, so the headers never depend on the request
+CORS_HEADERS = (("Access-Control-Allow-Origin", "*"),)
+CORS_PREFLIGHT_HEADERS = (
+    ("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, PATCH, OPTIONS"),
 )
 
+# Settings that never depend on the environment
+DEVELOPMENT_JWT_SECRET_KEY = "fallback-secret-key-for-development"
+STATIC_CONFIG = {
+    "JWT_TOKEN_LOCATION": ("headers",),
+    "JWT_HEADER_NAME": "Authorization",
+    "JWT_HEADER_TYPE": "Bearer",
+    "JSONIFY_MIMETYPE": "application/json",
+}
+
+# Body of every unhandled-error response; exception details are only logged
+GENERIC_ERROR_BODY = orjson.dumps({"error": "internal"})
+
+# JWT failure responses
+JSON_HEADERS = (("Content-Type", "application/json"),)
+EXPIRED_TOKEN_RESPONSE = (
+    orjson.dumps({"msg": "Token has expired", "error": "token_expired"}),
+    401,
+    JSON_HEADERS,
+)
+
+
+@lru_cache(maxsize=256)
+def jwt_error_response(
+    msg: str, error: str
+) -> tuple[bytes, int, tuple[tuple[str, str], ...]]:
+    """Return the 401 response for a JWT failure, serialized once per reason.
+
+    The reasons come from a small, fixed set of flask_jwt_extended and PyJWT
+    messages, so nearly every failure is served from the cache.
+    """
+    return orjson.dumps({"msg": msg, "error": error}), 401, JSON_HEADERS
+
+
+configure_root_logger()
+
+
+def init_sentry() -> None:
+    """Initialize Sentry once per process, and only when a DSN is configured."""
+    dsn = os.environ.get("SENTRY_DSN")
+    if not dsn or sentry_sdk.get_client().is_active():
+        return
+    sentry_sdk.init(
+        dsn=dsn,
+        traces_sample_rate=float(os.environ.get("SENTRY_TRACES_RATE", "0.01")),
+        profiles_sample_rate=float(os.environ.get("SENTRY_PROFILES_RATE", "0.01")),
+        spotlight=os.environ.get("FLASK_ENV", "development") == "development",
+    )
+
+
+# Done at import time so repeated create_app() calls never re-initialize the SDK
+init_sentry()
+
 
 def create_app():
     db = DatabaseManager()
+    db.set_page_size()
+    db.enable_wal_mode()
     db.create_tables()
+    db.start_periodic_optimize()
 
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.url_map.strict_slashes = False
+    # No route relies on "//" being collapsed, so skip the redirect check
+    app.url_map.merge_slashes = False
 
-    # Configure CORS based on environment
     flask_env = os.environ.get("FLASK_ENV", "development")
-    logger.info(f"FLASK_ENV: {flask_env}")
-    CORS(app, resources={r"/*": {"origins": "*"}})
+    logger.info("FLASK_ENV: %s", flask_env)
+
+    # Configure CORS
+    @app.after_request
+    def add_cors_headers(response):
+        response.headers.extend(CORS_HEADERS)
+        return response
+
+    # Answer preflights directly. A catch-all OPTIONS route would make unknown
+    # paths answer 405 instead of 404 for every other method.
+    @app.before_request
+    def cors_preflight():
+        if request.method == "OPTIONS":
+            response = Response(status=204, headers=CORS_PREFLIGHT_HEADERS)
+            # Allow every header the client asks for, as flask-cors did
+            requested_headers = request.headers.get("Access-Control-Request-Headers")
+            if requested_headers:
+                response.headers["Access-Control-Allow-Headers"] = requested_headers
+            return response
+        return None
 
     # Register Swagger UI blueprint
     app.register_blueprint(swagger_ui_blueprint, url_prefix=SWAGGER_URL)
@@ -34,11 +115,9 @@ def create_app():
     # Create static directory if it doesn't exist
     os.makedirs(os.path.join(app.root_path, "static"), exist_ok=True)
 
-    @app.route("/static/swagger.json")
-    def create_swagger_spec():
-        return jsonify(spec.to_dict())
-
-    # Register logging middleware
+    # Register logging middleware. after_request hooks run in reverse order, so
+    # compression is registered first to run after the response has been logged
+    app.after_request(compress_response)
     app.before_request(log_request)
     app.after_request(log_response)
 
@@ -46,36 +125,49 @@ def create_app():
     logger.info("Application starting up")
 
     # JWT Configuration
-    app.config["JWT_SECRET_KEY"] = os.environ.get(
-        "JWT_SECRET_KEY", "fallback-secret-key-for-development"
-    )
-    if (
-        flask_env != "development"
-        and app.config["JWT_SECRET_KEY"] == "fallback-secret-key-for-development"
-    ):
-        raise ValueError("JWT_SECRET_KEY must be set in production environment")
-    logger.info(f"JWT_SECRET_KEY: {app.config['JWT_SECRET_KEY']}")
+    app.config.update(STATIC_CONFIG)
+    jwt_private_key = os.environ.get("JWT_PRIVATE_KEY")
+    jwt_public_key = os.environ.get("JWT_PUBLIC_KEY")
+    if jwt_private_key and jwt_public_key:
+        # Ed25519 keypair in PEM format: tokens are signed and verified with EdDSA
+        app.config["JWT_ALGORITHM"] = "EdDSA"
+        app.config["JWT_PRIVATE_KEY"] = jwt_private_key
+        app.config["JWT_PUBLIC_KEY"] = jwt_public_key
+        logger.info("JWT_ALGORITHM: EdDSA")
+    else:
+        app.config["JWT_SECRET_KEY"] = os.environ.get(
+            "JWT_SECRET_KEY", DEVELOPMENT_JWT_SECRET_KEY
+        )
+        if (
+            flask_env != "development"
+            and app.config["JWT_SECRET_KEY"] == DEVELOPMENT_JWT_SECRET_KEY
+        ):
+            raise ValueError("JWT_SECRET_KEY must be set in production environment")
+        logger.info(
+            "JWT_SECRET_KEY configured: %s",
+            app.config["JWT_SECRET_KEY"] != DEVELOPMENT_JWT_SECRET_KEY,
+        )
     app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(
         seconds=int(os.environ.get("JWT_ACCESS_TOKEN_EXPIRES", 3600))
     )
-    logger.info(f"JWT_ACCESS_TOKEN_EXPIRES: {app.config['JWT_ACCESS_TOKEN_EXPIRES']}")
+    logger.info("JWT_ACCESS_TOKEN_EXPIRES: %s", app.config["JWT_ACCESS_TOKEN_EXPIRES"])
     app.config["JWT_REFRESH_TOKEN_EXPIRES"] = timedelta(
         seconds=int(os.environ.get("JWT_REFRESH_TOKEN_EXPIRES", 2592000))
     )
-    logger.info(f"JWT_ACCESS_TOKEN_EXPIRES: {app.config['JWT_ACCESS_TOKEN_EXPIRES']}")
-    app.config["JWT_TOKEN_LOCATION"] = ["headers"]
-    app.config["JWT_HEADER_NAME"] = "Authorization"
-    app.config["JWT_HEADER_TYPE"] = "Bearer"
-
-    jwt = JWTManager(app)
+    logger.info("JWT_ACCESS_TOKEN_EXPIRES: %s", app.config["JWT_ACCESS_TOKEN_EXPIRES"])
+    app.config["JWT_CACHE_MAX"] = int(os.environ.get("JWT_CACHE_MAX", 10000))
+    app.config["JWT_CACHE_TTL"] = int(os.environ.get("JWT_CACHE_TTL", 30))
 
-    app.config["JSONIFY_MIMETYPE"] = "application/json"
+    jwt = CachingJWTManager(app)
 
     # Register error handlers
     @app.errorhandler(Exception)
     def handle_exception(e):
-        logger.error("Unhandled exception", exc_info=True)
-        return {"error": str(e)}, 500
+        if isinstance(e, HTTPException):
+            return e
+        logger.exception("Unhandled exception")
+        # after_request hooks mutate responses, so only the body is shared
+        return Response(GENERIC_ERROR_BODY, status=500, mimetype="application/json")
 
     # import and register blueprints
     from app.routes.account_asset_routes import account_asset_bp
@@ -92,47 +184,60 @@ def create_app():
     from app.routes.transaction_routes import transaction_bp
     from app.routes.user_routes import user_bp
 
-    app.register_blueprint(user_bp, url_prefix="/users")  # Register user routes
-    app.register_blueprint(
-        account_bp, url_prefix="/accounts"
-    )  # Register account routes
-    app.register_blueprint(bank_bp, url_prefix="/banks")  # Register bank routes
-    app.register_blueprint(
-        transaction_bp, url_prefix="/transactions"
-    )  # Register transaction routes
-    app.register_blueprint(budget_bp, url_prefix="/budgets")
-    app.register_blueprint(investment_bp, url_prefix="/investments")
-    app.register_blueprint(stock_bp, url_prefix="/stocks")
-    app.register_blueprint(asset_bp, url_prefix="/assets")
-    app.register_blueprint(account_asset_bp, url_prefix="/account_assets")
-    app.register_blueprint(refund_item_bp, url_prefix="/refund_items")
-    app.register_blueprint(refund_group_bp, url_prefix="/refund_groups")
-    app.register_blueprint(gocardless_bp, url_prefix="/gocardless")
-    app.register_blueprint(liability_bp, url_prefix="/liabilities")
-    app.register_blueprint(liability_payment_bp, url_prefix="/liability_payments")
+    blueprints = (
+        ("users", user_bp),
+        ("accounts", account_bp),
+        ("banks", bank_bp),
+        ("transactions", transaction_bp),
+        ("budgets", budget_bp),
+        ("investments", investment_bp),
+        ("stocks", stock_bp),
+        ("assets", asset_bp),
+        ("account_assets", account_asset_bp),
+        ("refund_items", refund_item_bp),
+        ("refund_groups", refund_group_bp),
+        ("gocardless", gocardless_bp),
+        ("liabilities", liability_bp),
+        ("liability_payments", liability_payment_bp),
+    )
+    for prefix, blueprint in blueprints:
+        app.register_blueprint(blueprint, url_prefix=f"/{prefix}")
 
     # Register swagger documentation for liability routes
     from app.routes.liability_routes import register_liability_swagger_docs
 
     register_liability_swagger_docs()
 
+    # Every route has documented itself by now, so the spec can be serialized once
+    swagger_json = orjson.dumps(spec.to_dict())
+    swagger_etag = hashlib.blake2b(swagger_json, digest_size=8).hexdigest()
+
+    @app.route("/static/swagger.json")
+    def create_swagger_spec():
+        response = Response(swagger_json, mimetype="application/json")
+        response.set_etag(swagger_etag)
+        return response.make_conditional(request)
+
     @app.route("/health")
     def health():
         return jsonify({"status": "ok"}), 200
 
     @jwt.invalid_token_loader
     def invalid_token_callback(error_string):
-        return jsonify({"msg": "Invalid token", "error": str(error_string)}), 401
+        logger.warning("Invalid token: %s", error_string)
+        return jwt_error_response("Invalid token", str(error_string))
 
     @jwt.unauthorized_loader
     def unauthorized_callback(error_string):
-        return jsonify(
-            {"msg": "Missing Authorization Header", "error": str(error_string)}
-        ), 401
+        logger.warning("Unauthorized request: %s", error_string)
+        return jwt_error_response("Missing Authorization Header", str(error_string))
 
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_data):
-        return jsonify({"msg": "Token has expired", "error": "token_expired"}), 401
+        return EXPIRED_TOKEN_RESPONSE
+
+    # Compile the URL map now instead of on the first request
+    app.url_map.update()
 
     logger.info("Application initialized successfully")
     return app
@@ -0,0 +1,113 @@
+import hashlib
+import time
+from collections.abc import Iterable
+from threading import Lock
+from typing import Any, NamedTuple
+
+import jwt
+from cachetools import TTLCache
+from flask import Flask
+from flask_jwt_extended import JWTManager
+from flask_jwt_extended.config import config
+from flask_jwt_extended.tokens import _decode_jwt
+from jwt import ExpiredSignatureError
+
+
+class DecodeParams(NamedTuple):
+    """JWT decoding settings, frozen from the app config at startup."""
+
+    algorithms: list[str]
+    audience: str | Iterable[str] | None
+    identity_claim_key: str
+    issuer: str | None
+    leeway: int
+    secret: str
+    verify_aud: bool
+    verify_sub: bool
+
+
+def token_cache_key(encoded_token: str) -> bytes:
+    """Return a short, fixed-size cache key for a raw JWT."""
+    return hashlib.sha256(encoded_token.encode()).digest()[:16]
+
+
+class CachingJWTManager(JWTManager):
+    """JWTManager that reuses verified claims for tokens it has already seen.
+
+    Signature verification is only performed the first time a token is
+    presented. Verified claims are then kept in a bounded TTL cache until
+    either the cache TTL or the token's own ``exp`` is reached, whichever
+    comes first. Tokens that fail validation are never cached. Each caller
+    gets its own copy of the cached claims.
+
+    This relies on flask_jwt_extended private APIs, which is why
+    requirements.txt pins its exact version.
+
+    Decoding settings are read from the config once, in ``init_app``, instead
+    of on every decode, so the JWT settings must not change after startup.
+    """
+
+    def init_app(self, app: Flask, add_context_processor: bool = False) -> None:
+        super().init_app(app, add_context_processor)
+        self._token_cache: TTLCache[bytes, tuple[dict[str, Any], float]] = TTLCache(
+            maxsize=app.config.get("JWT_CACHE_MAX", 10000),
+            ttl=app.config.get("JWT_CACHE_TTL", 30),
+        )
+        self._token_cache_ttl = float(app.config.get("JWT_CACHE_TTL", 30))
+        self._token_cache_lock = Lock()
+
+        with app.app_context():
+            params = DecodeParams(
+                algorithms=config.decode_algorithms,
+                audience=config.decode_audience,
+                identity_claim_key=config.identity_claim_key,
+                issuer=config.decode_issuer,
+                leeway=config.leeway,
+                secret=config.decode_key,
+                verify_aud=config.decode_audience is not None,
+                verify_sub=config.verify_sub,
+            )
+        self._decode_params = params
+        self.decode_key_loader(lambda _header, _payload: params.secret)
+
+    def _decode_jwt_from_config(
+        self,
+        encoded_token: str,
+        csrf_value: str | None = None,
+        allow_expired: bool = False,
+    ) -> dict[str, Any]:
+        if allow_expired or csrf_value is not None:
+            return super()._decode_jwt_from_config(
+                encoded_token, csrf_value, allow_expired
+            )
+
+        key = token_cache_key(encoded_token)
+        now = time.time()
+        with self._token_cache_lock:
+            cached = self._token_cache.get(key)
+        if cached is not None and cached[1] > now:
+            # A copy, so a caller mutating get_jwt() cannot affect other requests
+            return dict(cached[0])
+
+        # Raises on invalid or expired tokens, so only valid claims get cached
+        claims = self._decode_verified(encoded_token)
+        deadline = now + self._token_cache_ttl
+        if "exp" in claims:
+            deadline = min(deadline, float(claims["exp"]))
+        with self._token_cache_lock:
+            self._token_cache[key] = (claims, deadline)
+        return dict(claims)
+
+    def _decode_verified(self, encoded_token: str) -> dict[str, Any]:
+        kwargs = {
+            **self._decode_params._asdict(),
+            "csrf_value": None,
+            "encoded_token": encoded_token,
+        }
+        try:
+            return _decode_jwt(**kwargs, allow_expired=False)
+        except ExpiredSignatureError as e:
+            # The expired_token_loader callback receives the header and claims
+            e.jwt_header = jwt.get_unverified_header(encoded_token)  # type: ignore[attr-defined]
+            e.jwt_data = _decode_jwt(**kwargs, allow_expired=True)  # type: ignore[attr-defined]
+            raise
@@ -1,940 +1,243 @@
-from typing import TypedDict
+import hashlib
+import os
+import re
+import sys
+from dataclasses import dataclass, fields
+from functools import cache
+from importlib.resources import files
+from types import MappingProxyType
+from typing import NamedTuple, NotRequired, TypedDict
 
+import orjson
 
-class SubCategory(TypedDict):
+__all__ = [
+    "ALL_CATEGORIES_JSON",
+    "CATEGORIES_BY_TYPE",
+    "CATEGORIES_JSON_BY_TYPE",
+    "DEFAULT_ICON_SET",
+    "ENABLED_LANGUAGES",
+    "EXPENSE_CATEGORIES_JSON",
+    "INCOME_CATEGORIES_JSON",
+    "LANGUAGES",
+    "TRANSFER_CATEGORIES_JSON",
+    "Category",
+    "CategoryData",
+    "LocalizedName",
+    "SubCategory",
+    "SubCategoryRow",
+    "categories_etag",
+    "expense_categories",
+    "income_categories",
+    "localized_categories_json",
+    "transfer_categories",
+]
+
+
+# Subcategories are authored as [fr, en, iconName] rows, with an optional
+# fourth iconSet column
+SubCategoryRow = list[str]
+
+
+class CategoryData(TypedDict):
     name: dict[str, str]
+    color: str
+    iconName: str
+    iconSet: NotRequired[str]
+    subCategories: list[SubCategoryRow]
+
+
+LANGUAGES = ("fr", "en")
+
+# Languages this deployment serves through ?lang=; only their projections
+# are encoded at import
+ENABLED_LANGUAGES = tuple(
+    lang.strip() for lang in os.environ.get("CATEGORY_LOCALES", "fr,en").split(",")
+)
+if not ENABLED_LANGUAGES or not set(ENABLED_LANGUAGES) <= set(LANGUAGES):
+    raise ValueError(f"CATEGORY_LOCALES must be a subset of {LANGUAGES}")
+
+
+class LocalizedName(NamedTuple):
+    fr: str
+    en: str
+
+
+@dataclass(slots=True, frozen=True)
+class SubCategory:
+    name: LocalizedName
     iconName: str
     iconSet: str
 
 
-class Category(TypedDict):
-    name: dict[str, str]
+@dataclass(slots=True, frozen=True)
+class Category:
+    name: LocalizedName
     color: str
     iconName: str
     iconSet: str
-    subCategories: list[SubCategory] | None
+    # Always a tuple, empty for categories without subcategories
+    subCategories: tuple[SubCategory, ...]
 
 
-expense_categories: list[Category] = [
-    {
-        "name": {
-            "fr": "Abonnements",
-            "en": "Subscriptions",
-        },
-        "color": "#663A66",
-        "iconName": "tv-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Abonnements - Autres",
-                    "en": "Subscriptions - Other",
-                },
-                "iconName": "tv-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Câble / Satellite",
-                    "en": "Cable / Satellite",
-                },
-                "iconName": "tv-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Internet",
-                    "en": "Internet",
-                },
-                "iconName": "globe-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Téléphone fixe",
-                    "en": "Fixed phone",
-                },
-                "iconName": "call-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Téléphonie mobile",
-                    "en": "Mobile phone",
-                },
-                "iconName": "phone-portrait-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Achats & Shopping",
-            "en": "Shopping & Purchases",
-        },
-        "color": "#B6012E",
-        "iconName": "cart-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Achats & Shopping - Autres",
-                    "en": "Shopping & Purchases - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Articles de sport",
-                    "en": "Sports equipment",
-                },
-                "iconName": "fitness-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Cadeaux",
-                    "en": "Gifts",
-                },
-                "iconName": "gift-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Musique",
-                    "en": "Music",
-                },
-                "iconName": "musical-notes-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Vêtements/Chaussures",
-                    "en": "Clothes/Shoes",
-                },
-                "iconName": "shirt-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Alimentation & Restauration",
-            "en": "Food & Restaurants",
-        },
-        "color": "#FFB200",
-        "iconName": "restaurant-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Alimentation & Restauration - Autres",
-                    "en": "Food & Restaurants - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Café",
-                    "en": "Cafe",
-                },
-                "iconName": "cafe-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Fast foods",
-                    "en": "Fast foods",
-                },
-                "iconName": "fast-food-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Restaurants",
-                    "en": "Restaurants",
-                },
-                "iconName": "restaurant-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Supermarché / Epicerie",
-                    "en": "Supermarket / Grocery",
-                },
-                "iconName": "cart-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Auto & Transports",
-            "en": "Auto & Transports",
-        },
-        "color": "#00AAAA",
-        "iconName": "car-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Auto & Transports - Autres",
-                    "en": "Auto & Transports - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Assurance véhicule",
-                    "en": "Vehicle insurance",
-                },
-                "iconName": "shield-checkmark-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Billets d'avion",
-                    "en": "Plane tickets",
-                },
-                "iconName": "airplane-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Billets de train",
-                    "en": "Train tickets",
-                },
-                "iconName": "train-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Carburant",
-                    "en": "Fuel",
-                },
-                "iconName": "fuel",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Entretien véhicule",
-                    "en": "Vehicle maintenance",
-                },
-                "iconName": "construct-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Location de véhicule",
-                    "en": "Vehicle rental",
-                },
-                "iconName": "car-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Péage",
-                    "en": "Toll",
-                },
-                "iconName": "cash-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Stationnement",
-                    "en": "Parking",
-                },
-                "iconName": "bus-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {"fr": "Banque", "en": "Bank"},
-        "color": "#84593F",
-        "iconName": "wallet-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Banque - Autres",
-                    "en": "Bank - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Débit mensuel carte",
-                    "en": "Monthly card debit",
-                },
-                "iconName": "card-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Epargne",
-                    "en": "Savings",
-                },
-                "iconName": "cash-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Frais bancaires",
-                    "en": "Banking fees",
-                },
-                "iconName": "card-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Hypothèque",
-                    "en": "Mortgage",
-                },
-                "iconName": "home-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Incidents de paiement",
-                    "en": "Payment incidents",
-                },
-                "iconName": "alert-circle-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Services Bancaires",
-                    "en": "Banking services",
-                },
-                "iconName": "card-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Divers",
-            "en": "Miscellaneous",
-        },
-        "color": "#2C5162",
-        "iconName": "help-circle-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "A catégoriser",
-                    "en": "To categorize",
-                },
-                "iconName": "document-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Assurance",
-                    "en": "Insurance",
-                },
-                "iconName": "shield-checkmark-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Autres dépenses",
-                    "en": "Other expenses",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Dons",
-                    "en": "Donations",
-                },
-                "iconName": "heart-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {"fr": "Esthétique & Soins", "en": "Esthetic & Care"},
-        "color": "#81003F",
-        "iconName": "cut-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Coiffeur",
-                    "en": "Hairdresser",
-                },
-                "iconName": "cut-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Cosmétique",
-                    "en": "Cosmetics",
-                },
-                "iconName": "color-palette-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Esthétique",
-                    "en": "Esthetic",
-                },
-                "iconName": "flower-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Esthétique & Soins - Autres",
-                    "en": "Esthetic & Care - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Spa & Massage",
-                    "en": "Spa & Massage",
-                },
-                "iconName": "water-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Impôts & Taxes",
-            "en": "Taxes & Taxes",
-        },
-        "color": "#004E80",
-        "iconName": "cash-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Amendes",
-                    "en": "Fines",
-                },
-                "iconName": "alert-circle-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Impôts & Taxes - Autres",
-                    "en": "Taxes & Taxes - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Impôts fonciers",
-                    "en": "Real estate taxes",
-                },
-                "iconName": "home-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Impôts sur le revenu",
-                    "en": "Income taxes",
-                },
-                "iconName": "cash-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {"fr": "Taxes", "en": "Taxes"},
-                "iconName": "receipt-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {"fr": "TVA", "en": "VAT"},
-                "iconName": "pricetag-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Logement",
-            "en": "Housing",
-        },
-        "color": "#677FE0",
-        "iconName": "home-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Assurance habitation",
-                    "en": "Housing insurance",
-                },
-                "iconName": "shield-checkmark-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Charges diverses",
-                    "en": "Miscellaneous charges",
-                },
-                "iconName": "document-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Décoration",
-                    "en": "Decoration",
-                },
-                "iconName": "color-palette-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Eau",
-                    "en": "Water",
-                },
-                "iconName": "water-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Electricité",
-                    "en": "Electricity",
-                },
-                "iconName": "flash-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Entretien",
-                    "en": "Maintenance",
-                },
-                "iconName": "hammer-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Extérieur et jardin",
-                    "en": "Outside and garden",
-                },
-                "iconName": "leaf-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Gaz",
-                    "en": "Gas",
-                },
-                "iconName": "flame-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Logement - Autres",
-                    "en": "Housing - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Loyer",
-                    "en": "Rent",
-                },
-                "iconName": "cash-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Loisirs & Sorties",
-            "en": "Leisure & Outings",
-        },
-        "color": "#773E8E",
-        "iconName": "game-controller-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Bars / Clubs",
-                    "en": "Bars / Clubs",
-                },
-                "iconName": "beer-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Divertissements",
-                    "en": "Entertainment",
-                },
-                "iconName": "film-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Frais Animaux",
-                    "en": "Animal expenses",
-                },
-                "iconName": "paw-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Hobbies",
-                    "en": "Hobbies",
-                },
-                "iconName": "game-controller-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Hôtels",
-                    "en": "Hotels",
-                },
-                "iconName": "bed-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Loisirs & Sorties - Autres",
-                    "en": "Leisure & Outings - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Sortie au restaurant",
-                    "en": "Restaurant outing",
-                },
-                "iconName": "restaurant-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Sorties culturelles",
-                    "en": "Cultural outings",
-                },
-                "iconName": "musical-notes-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Sport",
-                    "en": "Sport",
-                },
-                "iconName": "fitness-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Sports d'hiver",
-                    "en": "Winter sports",
-                },
-                "iconName": "snow-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Voyages / Vacances",
-                    "en": "Travels / Vacations",
-                },
-                "iconName": "airplane-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Retraits, Chq. et Vir.",
-            "en": "Withdrawals, Checks and Transfers",
-        },
-        "color": "#14A94E",
-        "iconName": "wallet-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Chèques",
-                    "en": "Checks",
-                },
-                "iconName": "document-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Retraits",
-                    "en": "Withdrawals",
-                },
-                "iconName": "cash-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Virements",
-                    "en": "Transfers",
-                },
-                "iconName": "swap-horizontal-outline",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Santé",
-            "en": "Health",
-        },
-        "color": "#9A0310",
-        "iconName": "medkit-outline",
-        "iconSet": "Ionicons",
-        "subCategories": [
-            {
-                "name": {
-                    "fr": "Dentiste",
-                    "en": "Dentist",
-                },
-                "iconName": "medkit-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Médecin",
-                    "en": "Doctor",
-                },
-                "iconName": "medkit-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Opticien / Ophtalmo.",
-                    "en": "Optician / Ophthalmologist",
-                },
-                "iconName": "glasses-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Pharmacie",
-                    "en": "Pharmacy",
-                },
-                "iconName": "medkit-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Santé - Autres",
-                    "en": "Health - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
-        ],
-    },
-    {
-        "name": {
-            "fr": "Scolarité & Enfants",
-            "en": "School & Children",
-        },
-        "color": "#7C3506",
-        "iconName": "school-outline",
-        "iconSet": "Ionicons",
+_COLOR_RE = re.compile(r"#[0-9A-Fa-f]{6}")
+
+
+def _check_color(color: str) -> str:
+    """Return a "#RRGGBB" color unchanged, failing on malformed input."""
+    if not _COLOR_RE.fullmatch(color):
+        raise ValueError(f"Invalid category color: {color!r}")
+    return color
+
+
+def _intern_tree(obj: object) -> None:
+    """Intern every string value of the parsed category data, in place."""
+    if isinstance(obj, list):
+        entries = list(enumerate(obj))
+    elif isinstance(obj, dict):
+        entries = list(obj.items())
+    else:
+        return
+    for key, value in entries:
+        if isinstance(value, str):
+            obj[key] = sys.intern(value)
+        else:
+            _intern_tree(value)
+
+
+# Every icon comes from this set unless the data says otherwise
+DEFAULT_ICON_SET = sys.intern("Ionicons")
+
+
+def _sub(
+    fr: str, en: str, icon_name: str, icon_set: str = DEFAULT_ICON_SET
+) -> SubCategory:
+    return SubCategory(name=LocalizedName(fr, en), iconName=icon_name, iconSet=icon_set)
+
+
+def _build_category(data: CategoryData) -> Category:
+    """Convert an authored category dict into its immutable form."""
+    return Category(
+        name=LocalizedName(**data["name"]),
+        color=_check_color(data["color"]),
+        iconName=data["iconName"],
+        iconSet=data.get("iconSet", DEFAULT_ICON_SET),
+        subCategories=tuple(_sub(*row) for row in data["subCategories"]),
+    )
+
+
+def _load_categories() -> dict[str, tuple[Category, ...]]:
+    """Parse categories.json into immutable categories, keyed by type.
+
+    The category tree lives in a JSON resource because parsing it is much
+    cheaper at import than compiling the equivalent Python literal. The parsed
+    dicts are dropped once converted, so every category object reachable from
+    this module is immutable and can be shared without defensive copies.
+    """
+    data: dict[str, list[CategoryData]] = orjson.loads(
+        files("app").joinpath("categories.json").read_bytes()
+    )
+    _intern_tree(data)
+    return {
+        category_type: tuple(map(_build_category, categories))
+        for category_type, categories in data.items()
+    }
+
+
+CATEGORIES_BY_TYPE: MappingProxyType[str, tuple[Category, ...]] = MappingProxyType(
+    _load_categories()
+)
+expense_categories = CATEGORIES_BY_TYPE["expense"]
+income_categories = CATEGORIES_BY_TYPE["income"]
+transfer_categories = CATEGORIES_BY_TYPE["transfer"]
+
+
+def _json_default(obj: object) -> dict[str, object]:
+    """Serialize categories with their names as {"fr": ..., "en": ...} objects."""
+    if isinstance(obj, Category | SubCategory):
+        data = {f.name: getattr(obj, f.name) for f in fields(obj)}
+        data["name"] = obj.name._asdict()
+        return data
+    raise TypeError
+
+
+def _dumps(obj: object) -> bytes:
+    return orjson.dumps(
+        obj,
+        default=_json_default,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS,
+    )
+
+
+# The category lists never change at runtime, so their JSON is encoded only once
+EXPENSE_CATEGORIES_JSON = _dumps(expense_categories)
+INCOME_CATEGORIES_JSON = _dumps(income_categories)
+TRANSFER_CATEGORIES_JSON = _dumps(transfer_categories)
+ALL_CATEGORIES_JSON = _dumps(
+    {
+        "expense": expense_categories,
+        "income": income_categories,
+        "transfer": transfer_categories,
+    }
+)
+CATEGORIES_JSON_BY_TYPE = MappingProxyType(
+    {
+        "expense": EXPENSE_CATEGORIES_JSON,
+        "income": INCOME_CATEGORIES_JSON,
+        "transfer": TRANSFER_CATEGORIES_JSON,
+    }
+)
+
+
+def _localize(category: Category, lang: str) -> dict[str, object]:
+    return {
+        "name": getattr(category.name, lang),
+        "color": category.color,
+        "iconName": category.iconName,
+        "iconSet": category.iconSet,
         "subCategories": [
             {
-                "name": {
-                    "fr": "Baby-sitters & Crèches",
-                    "en": "Baby-sitters & Crèches",
-                },
-                "iconName": "people-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Ecole",
-                    "en": "School",
-                },
-                "iconName": "school-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Fournitures scolaires",
-                    "en": "School supplies",
-                },
-                "iconName": "pencil-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Jouets",
-                    "en": "Toys",
-                },
-                "iconName": "game-controller-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Logement étudiant",
-                    "en": "Student housing",
-                },
-                "iconName": "home-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Pensions",
-                    "en": "Pensions",
-                },
-                "iconName": "cash-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Prêt étudiant",
-                    "en": "Student loan",
-                },
-                "iconName": "card-outline",
-                "iconSet": "Ionicons",
-            },
-            {
-                "name": {
-                    "fr": "Scolarité & Enfants - Autres",
-                    "en": "School & Children - Other",
-                },
-                "iconName": "ellipsis-horizontal",
-                "iconSet": "Ionicons",
-            },
+                "name": getattr(sub.name, lang),
+                "iconName": sub.iconName,
+                "iconSet": sub.iconSet,
+            }
+            for sub in category.subCategories
         ],
-    },
-]
+    }
 
-income_categories: list[Category] = [
-    {
-        "name": {
-            "fr": "Investissements",
-            "en": "Investments",
-        },
-        "color": "#2E7D32",
-        "iconName": "cash-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Allocations et pensions",
-            "en": "Allocations and pensions",
-        },
-        "color": "#43A047",
-        "iconName": "cash-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Autres rentrées",
-            "en": "Other income",
-        },
-        "color": "#66BB6A",
-        "iconName": "cash-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Dépôt d'argent",
-            "en": "Cash deposit",
-        },
-        "color": "#81C784",
-        "iconName": "cash-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Loyers reçus",
-            "en": "Rents received",
-        },
-        "color": "#4CAF50",
-        "iconName": "home-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Remboursements",
-            "en": "Refunds",
-        },
-        "color": "#388E3C",
-        "iconName": "swap-horizontal-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Retraite",
-            "en": "Retirement",
-        },
-        "color": "#1B5E20",
-        "iconName": "medkit-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Salaires",
-            "en": "Salaries",
-        },
-        "color": "#2E8B57",
-        "iconName": "cash-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Services",
-            "en": "Services",
-        },
-        "color": "#3CB371",
-        "iconName": "briefcase-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Subventions",
-            "en": "Subventions",
-        },
-        "color": "#228B22",
-        "iconName": "cash-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-    {
-        "name": {
-            "fr": "Ventes",
-            "en": "Sales",
-        },
-        "color": "#32CD32",
-        "iconName": "cart-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-]
 
-transfer_categories: list[Category] = [
-    {
-        "name": {
-            "fr": "Virements internes",
-            "en": "Internal transfers",
-        },
-        "color": "#2196F3",
-        "iconName": "swap-horizontal-outline",
-        "iconSet": "Ionicons",
-        "subCategories": None,
-    },
-]
+@cache
+def localized_categories_json(category_type: str | None, lang: str) -> bytes:
+    """Return the categories as JSON with their names in ``lang`` only.
+
+    ``category_type`` selects a single type; ``None`` returns every type
+    grouped by type, like ALL_CATEGORIES_JSON. Each projection is built and
+    encoded on first use, then reused for the lifetime of the process. Callers
+    must validate both arguments.
+    """
+    if category_type is None:
+        return _dumps(
+            {
+                type_name: [_localize(category, lang) for category in categories]
+                for type_name, categories in CATEGORIES_BY_TYPE.items()
+            }
+        )
+    return _dumps(
+        [_localize(category, lang) for category in CATEGORIES_BY_TYPE[category_type]]
+    )
+
+
+@cache
+def categories_etag(categories_json: bytes) -> str:
+    """Return the ETag of one served category blob, a hash of its bytes.
+
+    Every blob is a module-level constant or a cached projection, so each
+    tag is computed once per process.
+    """
+    return hashlib.blake2b(categories_json, digest_size=8).hexdigest()
+
+
+# Encode the projections this deployment serves up front, so that no request
+# pays for the first encoding
+for _category_type in (None, *CATEGORIES_BY_TYPE):
+    for _lang in ENABLED_LANGUAGES:
+        localized_categories_json(_category_type, _lang)
@@ -1,23 +1,775 @@
+import argparse
+import atexit
+import logging
 import os
 import sqlite3
-from enum import Enum
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from .exceptions import NoResultFoundError, QueryExecutionError
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
 
 class DatabaseError(Exception):
     """Raised when there are database configuration or access issues."""
 
 
-class QueryType(Enum):
-    SELECT = "select"
-    INSERT = "insert"
-    INSERT_RETURNING = "insert_returning"
-    UPDATE = "update"
-    UPDATE_RETURNING = "update_returning"
-    DELETE = "delete"
+# Connection tuning, overridable so tests can trade durability for speed
+SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+if SYNCHRONOUS not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+    raise ValueError(f"Invalid SQLITE_SYNCHRONOUS: {SYNCHRONOUS}")
+CACHE_SIZE_KIB = int(os.environ.get("SQLITE_CACHE_SIZE_KIB", 65536))
+MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 268435456))
+BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+
+# Queries slower than this are logged with their duration; unset disables
+# the timing altogether
+SLOW_QUERY_MS = (
+    float(os.environ["SQLITE_SLOW_QUERY_MS"])
+    if os.environ.get("SQLITE_SLOW_QUERY_MS")
+    else None
+)
+
+# Applied to every new connection; these settings do not persist in the file
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    f"PRAGMA synchronous = {SYNCHRONOUS};",
+    "PRAGMA temp_store = MEMORY;",
+    f"PRAGMA mmap_size = {MMAP_SIZE};",
+    f"PRAGMA cache_size = {-CACHE_SIZE_KIB};",
+    f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS};",
+)
+
+# Page size of the database file. Larger pages keep the transactions B-tree
+# shallower and write fewer, larger pages to the WAL
+PAGE_SIZE = 8192
+
+# Compiled statements kept per connection, keyed by SQL text. The services
+# issue a few hundred distinct queries once filters and sorting are applied,
+# more than sqlite3's default of 128
+STATEMENT_CACHE_SIZE = 256
+
+
+class _Connection(sqlite3.Connection):
+    """A connection with one cursor shared by all the queries it runs.
+
+    Every execute_* method drains its cursor before returning, so a single
+    cursor per connection can be reused instead of allocating one per query.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.shared_cursor = self.cursor()
+
+
+# Connections are reused per thread and database file by every DatabaseManager
+_thread_local = threading.local()
+
+# Every connection opened by this process, so they can be closed at exit
+_all_connections: list[sqlite3.Connection] = []
+_all_connections_lock = threading.Lock()
+
+# Connections left behind by finished threads, per database file. The
+# development server starts a thread per request, and each one would
+# otherwise open a new connection with a cold page and statement cache
+_idle_connections: dict[Path, list[sqlite3.Connection]] = {}
+
+
+class _ThreadConnections(dict[Path, sqlite3.Connection]):
+    """The connections of one thread, handed back when the thread ends."""
+
+    def __del__(self) -> None:
+        with _all_connections_lock:
+            for db_path, connection in self.items():
+                _idle_connections.setdefault(db_path, []).append(connection)
+
+
+@atexit.register
+def _close_connections() -> None:
+    with _all_connections_lock:
+        for connection in _all_connections:
+            # sqlite.org recommends PRAGMA optimize before closing a
+            # long-lived connection; it only analyzes what the connection saw
+            with suppress(sqlite3.Error):
+                connection.execute("PRAGMA optimize;")
+            connection.close()
+        _all_connections.clear()
+        _idle_connections.clear()
+
+
+# Database paths already checked by this process, keyed by SQLITE_DB_PATH.
+# Routes create a DatabaseManager per request, which should cost neither
+# filesystem calls nor a new Path, and sharing one Path object per file
+# keeps the per-thread connection lookups to an identity check
+_validated_databases: dict[str, Path] = {}
+
+# Database files whose schema has already been created by this process
+_initialized_databases: set[Path] = set()
+
+# How often a long-running process refreshes the query planner statistics
+OPTIMIZE_INTERVAL_SECONDS = 15 * 60
+
+# Database files that already have a PRAGMA optimize thread in this process
+_optimized_databases: set[Path] = set()
+
+
+def _fetch_dicts(cursor: sqlite3.Cursor) -> list[dict[str, Any]]:
+    """Fetch the remaining rows of a cursor as dicts keyed by column name.
+
+    Rows come back as plain tuples, which are cheaper to build than
+    sqlite3.Row objects that would only be converted to dicts anyway.
+    """
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row, strict=False)) for row in cursor]
+
+
+def _fetch_first_dict(cursor: sqlite3.Cursor) -> dict[str, Any] | None:
+    """Fetch the first row of a cursor as a dict, or None if it has no rows.
+
+    Further rows are read and discarded so the statement finishes and the
+    shared cursor is drained. sqlite3 steps one row ahead, so for the usual
+    single-row result there is nothing left to read.
+    """
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    for _ in cursor:
+        pass
+    return dict(zip((column[0] for column in cursor.description), row, strict=False))
+
+
+def _execute(
+    connection: _Connection, query: str, params: Sequence[Any] | None
+) -> sqlite3.Cursor:
+    # sqlite3 binds any sequence, so params are passed through as is
+    if params:
+        return connection.shared_cursor.execute(query, params)
+    return connection.shared_cursor.execute(query)
+
+
+def _log_if_slow(query: str, started_ns: int) -> None:
+    """Log a query that took longer than SLOW_QUERY_MS since started_ns.
+
+    Only the SQL text is logged, since the parameters may hold passwords.
+    """
+    elapsed_ms = (time.perf_counter_ns() - started_ns) / 1_000_000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, " ".join(query.split()))
+
+
+def _query_error(
+    err: Exception, query: str, params: Sequence[Any] | None
+) -> QueryExecutionError:
+    """Wrap the error of a failed statement.
+
+    SQLite already undid the statement. Outside a transaction nothing is left
+    pending, and an open transaction is for its owner to roll back.
+    """
+    return QueryExecutionError(
+        message=f"Error executing query: {err}",
+        query=query,
+        params=params or [],
+    )
+
+
+# The schema created by DatabaseManager.create_tables
+
+# Also used to rebuild the transactions table of databases created before its
+# foreign keys checked that both accounts belong to the transaction's user
+_TRANSACTIONS_COLUMNS = """(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    date TIMESTAMP NOT NULL,
+    date_accountability TIMESTAMP NOT NULL,
+    description TEXT NOT NULL,
+    amount DECIMAL(10,2) NOT NULL CHECK (amount > 0),
+    from_account_id INTEGER NOT NULL,
+    to_account_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    subcategory TEXT,
+    type TEXT NOT NULL CHECK (type IN (
+        'expense', 'income', 'transfer'
+    )),
+    is_investment BOOLEAN DEFAULT FALSE,
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (from_account_id, user_id)
+        REFERENCES accounts(id, user_id) ON DELETE CASCADE,
+    FOREIGN KEY (to_account_id, user_id)
+        REFERENCES accounts(id, user_id) ON DELETE CASCADE
+)"""
+
+_TABLES_DDL = (
+    """--sql
+        CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                password TEXT NOT NULL,
+                last_login TIMESTAMP);
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS banks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            website TEXT,
+            UNIQUE(user_id, name),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS accounts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            type TEXT NOT NULL CHECK (type IN (
+                'investment', 'income', 'expense', 'checking', 'savings', 'loan'
+            )),
+            bank_id INTEGER NOT NULL,
+            UNIQUE(user_id, bank_id, name, type),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+            FOREIGN KEY (bank_id) REFERENCES banks(id) ON DELETE CASCADE
+        );
+    """,
+    # Referenced by the composite foreign keys of transactions
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_id_user ON accounts(id, user_id);",
+    f"CREATE TABLE IF NOT EXISTS transactions {_TRANSACTIONS_COLUMNS};",
+    """--sql
+        CREATE TABLE IF NOT EXISTS account_balances (
+            account_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            current_balance REAL NOT NULL DEFAULT 0,
+            FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE
+        );
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS investment_details (
+            transaction_id INTEGER PRIMARY KEY,
+            asset_id INTEGER NOT NULL,
+            quantity DECIMAL(10,6) NOT NULL,
+            unit_price DECIMAL(10,2) NOT NULL,
+            fee DECIMAL(10,2) NOT NULL,
+            tax DECIMAL(10,2) NOT NULL,
+            total_paid DECIMAL(10,2),
+            investment_type TEXT NOT NULL CHECK (investment_type IN (
+                'Buy', 'Sell', 'Dividend', 'Interest', 'Deposit', 'Withdrawal'
+            )),
+            FOREIGN KEY (transaction_id) REFERENCES transactions(id) ON DELETE CASCADE,
+            FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+        );
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS assets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            symbol TEXT NOT NULL,
+            name TEXT NOT NULL,
+            UNIQUE(symbol, user_id),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS stock_cache (
+            symbol TEXT NOT NULL,
+            cache_type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            last_updated TEXT NOT NULL,
+            PRIMARY KEY (symbol, cache_type)
+        );
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS refund_groups (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS refund_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            income_transaction_id INTEGER NOT NULL,
+            expense_transaction_id INTEGER NOT NULL,
+            amount REAL NOT NULL,
+            refund_group_id INTEGER,
+            description TEXT,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (income_transaction_id) REFERENCES transactions (id) ON DELETE CASCADE,
+            FOREIGN KEY (expense_transaction_id) REFERENCES transactions (id) ON DELETE CASCADE,
+            FOREIGN KEY (refund_group_id) REFERENCES refund_groups (id) ON DELETE CASCADE
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS gocardless_requisitions (
+            requisition_id TEXT PRIMARY KEY,
+            link TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            institution_id TEXT NOT NULL,
+            reference TEXT,
+            agreement_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (agreement_id) REFERENCES gocardless_agreements (agreement_id) ON DELETE SET NULL
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS gocardless_accounts (
+            account_id TEXT PRIMARY KEY,
+            created_at TEXT NOT NULL,
+            last_accessed TEXT NOT NULL,
+            iban TEXT,
+            institution_id TEXT NOT NULL,
+            status TEXT,
+            owner_name TEXT,
+            currency TEXT,
+            balance REAL,
+            account_type TEXT,
+            user_id INTEGER NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS gocardless_cache (
+            cache_key TEXT NOT NULL,
+            cache_type TEXT NOT NULL,
+            data TEXT NOT NULL,
+            last_updated TEXT NOT NULL,
+            PRIMARY KEY (cache_key, cache_type)
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS gocardless_agreements (
+            agreement_id TEXT PRIMARY KEY,
+            institution_id TEXT NOT NULL,
+            max_historical_days INTEGER NOT NULL,
+            access_valid_for_days INTEGER NOT NULL,
+            access_scope TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS custom_prices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol TEXT NOT NULL,
+            date TEXT NOT NULL,
+            open DECIMAL(10,4) NOT NULL,
+            high DECIMAL(10,4) NOT NULL,
+            low DECIMAL(10,4) NOT NULL,
+            close DECIMAL(10,4) NOT NULL,
+            volume INTEGER DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS budgets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            month INTEGER NOT NULL,
+            amount DECIMAL(10,2) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            UNIQUE(user_id, category, year, month)
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS liabilities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            description TEXT,
+            liability_type TEXT NOT NULL CHECK (liability_type IN (
+                'standard_loan', 'partial_deferred_loan', 'total_deferred_loan',
+                'mortgage', 'credit_card', 'line_of_credit', 'other'
+            )),
+            principal_amount DECIMAL(10,2) NOT NULL,
+            interest_rate DECIMAL(5,3) NOT NULL,
+            start_date TIMESTAMP NOT NULL,
+            end_date TIMESTAMP,
+            compounding_period TEXT NOT NULL CHECK (compounding_period IN (
+                'daily', 'monthly', 'quarterly', 'annually'
+            )),
+            payment_frequency TEXT NOT NULL CHECK (payment_frequency IN (
+                'weekly', 'bi-weekly', 'monthly', 'quarterly', 'annually'
+            )),
+            payment_amount DECIMAL(10,2),
+            deferral_period_months INTEGER DEFAULT 0,
+            deferral_type TEXT CHECK (deferral_type IN (
+                'none', 'partial', 'total'
+            )),
+            direction TEXT NOT NULL CHECK (direction IN (
+                'i_owe', 'they_owe'
+            )),
+            account_id INTEGER,
+            lender_name TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (account_id) REFERENCES accounts (id) ON DELETE SET NULL
+        )
+    """,
+    """--sql
+        CREATE TABLE IF NOT EXISTS liability_payment_details (
+            transaction_id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            liability_id INTEGER NOT NULL,
+            payment_date TIMESTAMP NOT NULL,
+            amount DECIMAL(10,2) NOT NULL,
+            principal_amount DECIMAL(10,2) NOT NULL,
+            interest_amount DECIMAL(10,2) NOT NULL,
+            extra_payment DECIMAL(10,2) DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
+            FOREIGN KEY (liability_id) REFERENCES liabilities (id) ON DELETE CASCADE,
+            FOREIGN KEY (transaction_id) REFERENCES transactions (id) ON DELETE CASCADE
+        )
+    """,
+)
+
+_VIEWS_DDL = (
+    """--sql
+        CREATE VIEW IF NOT EXISTS asset_balances AS
+        SELECT
+            t.user_id,
+            i.asset_id,
+            a.symbol,
+            a.name as asset_name,
+            SUM(
+                CASE
+                    WHEN i.investment_type IN ('Buy', 'Deposit') THEN i.quantity
+                    WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN -i.quantity
+                    ELSE 0
+                END
+            ) as quantity,
+            MAX(t.date) as last_transaction_date
+        FROM investment_details i
+        JOIN transactions t ON i.transaction_id = t.id
+        JOIN assets a ON i.asset_id = a.id
+        GROUP BY t.user_id, i.asset_id, a.symbol, a.name
+        HAVING quantity > 0;
+    """,
+    # Recreated so databases built with the older definition, which
+    # grouped by the primary key, pick up this one
+    "DROP VIEW IF EXISTS liability_balances;",
+    """--sql
+        CREATE VIEW IF NOT EXISTS liability_balances AS
+        SELECT
+            l.id as liability_id,
+            l.user_id,
+            l.name as liability_name,
+            l.liability_type,
+            l.principal_amount,
+            l.interest_rate,
+            l.direction,
+            l.start_date,
+            l.end_date,
+            COALESCE(
+                (SELECT SUM(principal_amount)
+                FROM liability_payment_details
+                WHERE liability_id = l.id
+                ), 0
+            ) as principal_paid,
+            COALESCE(
+                (SELECT SUM(interest_amount)
+                FROM liability_payment_details
+                WHERE liability_id = l.id
+                ), 0
+            ) as interest_paid,
+            l.principal_amount - COALESCE(
+                (SELECT SUM(principal_amount)
+                FROM liability_payment_details
+                WHERE liability_id = l.id
+                ), 0
+            ) as remaining_balance,
+            0 as missed_payments_count,
+            NULL as next_payment_date
+        FROM liabilities l;
+    """,
+    """--sql
+        CREATE VIEW IF NOT EXISTS asset_balances_by_account AS
+        SELECT
+            t.user_id,
+            CASE
+                WHEN i.investment_type IN ('Buy', 'Deposit') THEN t.to_account_id
+                WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN t.from_account_id
+            END as account_id,
+            acc.name as account_name,
+            acc.type as account_type,
+            i.asset_id,
+            a.symbol,
+            a.name as asset_name,
+            SUM(
+                CASE
+                    WHEN i.investment_type IN ('Buy', 'Deposit') THEN i.quantity
+                    WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN -i.quantity
+                    ELSE 0
+                END
+            ) as quantity,
+            MAX(t.date) as last_transaction_date
+        FROM investment_details i
+        JOIN transactions t ON i.transaction_id = t.id
+        JOIN assets a ON i.asset_id = a.id
+        JOIN accounts acc ON (
+            (i.investment_type IN ('Buy', 'Deposit') AND acc.id = t.to_account_id) OR
+            (i.investment_type IN ('Sell', 'Withdrawal') AND acc.id = t.from_account_id)
+        )
+        GROUP BY
+            t.user_id,
+            CASE
+                WHEN i.investment_type IN ('Buy', 'Deposit') THEN t.to_account_id
+                WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN t.from_account_id
+            END,
+            acc.name,
+            acc.type,
+            i.asset_id,
+            a.symbol,
+            a.name
+        HAVING quantity > 0;
+    """,
+)
+
+# Sets current_balance from the account's transactions, for the accounts
+# matched by the "account_id" condition appended to it
+_RECOMPUTE_BALANCES = """
+    UPDATE account_balances
+    SET current_balance = COALESCE(
+        (SELECT SUM(amount) FROM transactions
+        WHERE to_account_id = account_balances.account_id), 0
+    ) - COALESCE(
+        (SELECT SUM(amount) FROM transactions
+        WHERE from_account_id = account_balances.account_id), 0
+    )
+    WHERE account_id
+"""
+
+_TRIGGERS_DDL = (
+    # account_balances is kept up to date by the triggers below instead
+    # of summing every transaction of the account on each read. They
+    # recompute the balances a write touches from the covering per-account
+    # indexes, rather than adding each amount to the stored value, so
+    # floating-point rounding cannot build up over time
+    """--sql
+        CREATE TRIGGER IF NOT EXISTS trg_account_balances_account_insert
+        AFTER INSERT ON accounts
+        BEGIN
+            INSERT INTO account_balances (account_id, user_id)
+            VALUES (NEW.id, NEW.user_id);
+        END;
+    """,
+    "DROP TRIGGER IF EXISTS trg_account_balances_transaction_insert;",
+    f"""--sql
+        CREATE TRIGGER IF NOT EXISTS trg_account_balances_transaction_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            {_RECOMPUTE_BALANCES} IN (NEW.from_account_id, NEW.to_account_id);
+        END;
+    """,
+    "DROP TRIGGER IF EXISTS trg_account_balances_transaction_delete;",
+    f"""--sql
+        CREATE TRIGGER IF NOT EXISTS trg_account_balances_transaction_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            {_RECOMPUTE_BALANCES} IN (OLD.from_account_id, OLD.to_account_id);
+        END;
+    """,
+    "DROP TRIGGER IF EXISTS trg_account_balances_transaction_update;",
+    f"""--sql
+        CREATE TRIGGER IF NOT EXISTS trg_account_balances_transaction_update
+        AFTER UPDATE OF amount, from_account_id, to_account_id ON transactions
+        BEGIN
+            {_RECOMPUTE_BALANCES} IN (
+                OLD.from_account_id, OLD.to_account_id,
+                NEW.from_account_id, NEW.to_account_id
+            );
+        END;
+    """,
+    # One validation trigger per transaction type, so an insert only runs
+    # the checks of its own type. They replace trg_validate_transaction
+    "DROP TRIGGER IF EXISTS trg_validate_transaction;",
+    """--sql
+        CREATE TRIGGER IF NOT EXISTS trg_validate_income_transaction
+        BEFORE INSERT ON transactions
+        WHEN NEW.type = 'income'
+        BEGIN
+            SELECT
+                CASE
+                    WHEN to_type NOT IN ('checking', 'savings', 'investment', 'loan') THEN
+                        RAISE(ABORT, 'Income cannot be received in this type of account')
+                    WHEN from_type != 'income' THEN
+                        RAISE(ABORT, 'Income must originate from an income account')
+                END
+            FROM (
+                SELECT
+                    (SELECT type FROM accounts WHERE id = NEW.from_account_id) AS from_type,
+                    (SELECT type FROM accounts WHERE id = NEW.to_account_id) AS to_type
+            );
+        END;
+    """,
+    """--sql
+        CREATE TRIGGER IF NOT EXISTS trg_validate_expense_transaction
+        BEFORE INSERT ON transactions
+        WHEN NEW.type = 'expense'
+        BEGIN
+            SELECT
+                CASE
+                    WHEN from_type NOT IN ('checking', 'savings', 'investment', 'loan') THEN
+                        RAISE(ABORT, 'Expenses cannot be paid from this type of account')
+                    WHEN to_type != 'expense' THEN
+                        RAISE(ABORT, 'Expenses must go to an expense account')
+                END
+            FROM (
+                SELECT
+                    (SELECT type FROM accounts WHERE id = NEW.from_account_id) AS from_type,
+                    (SELECT type FROM accounts WHERE id = NEW.to_account_id) AS to_type
+            );
+        END;
+    """,
+    """--sql
+        CREATE TRIGGER IF NOT EXISTS trg_validate_transfer_transaction
+        BEFORE INSERT ON transactions
+        WHEN NEW.type = 'transfer'
+        BEGIN
+            SELECT
+                CASE
+                    WHEN from_type NOT IN ('checking', 'savings', 'investment', 'loan') THEN
+                        RAISE(ABORT, 'Cannot transfer from this type of account')
+                    WHEN to_type NOT IN ('checking', 'savings', 'investment', 'loan') THEN
+                        RAISE(ABORT, 'Cannot transfer to this type of account')
+                END
+            FROM (
+                SELECT
+                    (SELECT type FROM accounts WHERE id = NEW.from_account_id) AS from_type,
+                    (SELECT type FROM accounts WHERE id = NEW.to_account_id) AS to_type
+            );
+        END;
+    """,
+    """--sql
+        CREATE TRIGGER IF NOT EXISTS trg_validate_account_bank_ownership_insert
+        BEFORE INSERT ON accounts
+        BEGIN
+            SELECT CASE
+                WHEN (
+                    SELECT user_id
+                    FROM banks
+                    WHERE id = NEW.bank_id
+                ) != NEW.user_id
+                THEN RAISE(ABORT, 'Cannot insert account with bank owned by different user')
+            END;
+        END;
+    """,
+    """--sql
+        CREATE TRIGGER IF NOT EXISTS trg_validate_account_bank_ownership_update
+        BEFORE UPDATE ON accounts
+        WHEN NEW.bank_id != OLD.bank_id
+        BEGIN
+            SELECT CASE
+                WHEN (
+                    SELECT user_id
+                    FROM banks
+                    WHERE id = NEW.bank_id
+                ) != NEW.user_id
+                THEN RAISE(ABORT, 'Cannot update account to use bank owned by different user')
+            END;
+        END;
+    """,
+    # The composite foreign keys of transactions check account ownership
+    "DROP TRIGGER IF EXISTS trg_validate_transaction_account_ownership_insert;",
+    "DROP TRIGGER IF EXISTS trg_validate_transaction_account_ownership_update;",
+)
+
+_INDEXES_DDL = (
+    # Users table - email is used for login/authentication
+    "CREATE INDEX IF NOT EXISTS idx_banks_user_id ON banks(user_id);",
+    "CREATE INDEX IF NOT EXISTS idx_accounts_user_type ON accounts(user_id, type);",
+    # Covers the columns balance and timeline queries read, so they
+    # never have to look the row up in the table itself
+    "DROP INDEX IF EXISTS idx_transactions_user_date;",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_user_date_cov ON transactions(user_id, date, from_account_id, to_account_id, amount, type);",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_user_date_acc ON transactions(user_id, date_accountability);",
+    # One index per account column, so both sides of
+    # "from_account_id = ? OR to_account_id = ?" can use an index. Date
+    # and amount make them covering for per-account balance history
+    "DROP INDEX IF EXISTS idx_transactions_accounts;",
+    "DROP INDEX IF EXISTS idx_transactions_from;",
+    "DROP INDEX IF EXISTS idx_transactions_to;",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_from_date ON transactions(from_account_id, date, amount);",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_to_date ON transactions(to_account_id, date, amount);",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_user_type ON transactions(user_id, type);",
+    "CREATE INDEX IF NOT EXISTS idx_assets_user ON assets(user_id);",
+    "CREATE INDEX IF NOT EXISTS idx_investment_details_asset ON investment_details(asset_id);",
+    "CREATE INDEX IF NOT EXISTS idx_gocardless_requisitions_user ON gocardless_requisitions(user_id);",
+    "CREATE INDEX IF NOT EXISTS idx_gocardless_accounts_user ON gocardless_accounts(user_id);",
+    "CREATE INDEX IF NOT EXISTS idx_gocardless_accounts_institution ON gocardless_accounts(institution_id);",
+    "CREATE INDEX IF NOT EXISTS idx_gocardless_agreements_user ON gocardless_agreements(user_id);",
+    "CREATE INDEX IF NOT EXISTS idx_gocardless_agreements_institution ON gocardless_agreements(institution_id);",
+    "CREATE INDEX IF NOT EXISTS idx_liabilities_user ON liabilities(user_id);",
+    "CREATE INDEX IF NOT EXISTS idx_liabilities_type ON liabilities(liability_type);",
+    "CREATE INDEX IF NOT EXISTS idx_liability_payment_details_liability ON liability_payment_details(liability_id);",
+    "CREATE INDEX IF NOT EXISTS idx_liability_payment_details_user ON liability_payment_details(user_id);",
+    "CREATE INDEX IF NOT EXISTS idx_liability_payment_details_date ON liability_payment_details(payment_date);",
+)
+
+# Accounts created before account_balances was a table have no row
+# yet. Rows kept by older versions of the balance triggers, which added
+# each amount to the stored value, are recomputed from scratch
+_SEEDS_DDL = (
+    """--sql
+        INSERT INTO account_balances (account_id, user_id, current_balance)
+        SELECT
+            a.id,
+            a.user_id,
+            COALESCE(
+                (SELECT SUM(amount) FROM transactions WHERE to_account_id = a.id),
+                0
+            ) - COALESCE(
+                (SELECT SUM(amount) FROM transactions WHERE from_account_id = a.id),
+                0
+            )
+        FROM accounts a
+        -- Without a WHERE clause, ON CONFLICT would parse as a join constraint
+        WHERE true
+        ON CONFLICT (account_id) DO UPDATE
+        SET current_balance = excluded.current_balance;
+    """,
+)
+
+# Not every statement ends with a semicolon, so normalize them before
+# sending the whole schema as one script. The schema only changes
+# with a new version, which is also when statistics for new indexes
+# are missing, so ANALYZE runs last. Built once, when the module is imported
+_SCHEMA_SCRIPT = "\n".join(
+    statement.strip().rstrip(";") + ";"
+    for statement in (
+        *_TABLES_DDL,
+        *_VIEWS_DDL,
+        *_TRIGGERS_DDL,
+        *_INDEXES_DDL,
+        *_SEEDS_DDL,
+        "ANALYZE",
+    )
+)
+
+# The script's checksum is stored as the database's user_version, so an
+# unchanged schema is not re-parsed every time a worker starts
+_SCHEMA_VERSION = zlib.crc32(_SCHEMA_SCRIPT.encode()) & 0x7FFFFFFF
 
 
 class DatabaseManager:
@@ -28,6 +780,11 @@ class DatabaseManager:
         if not db_path:
             raise DatabaseError("SQLITE_DB_PATH environment variable must be set")
 
+        validated = _validated_databases.get(db_path)
+        if validated is not None:
+            self.db_path = validated
+            return
+
         self.db_path = Path(db_path)
 
         # Validate the path
@@ -47,722 +804,383 @@ class DatabaseManager:
                 f"No write permission for database file: {self.db_path}"
             )
 
-    def connect_to_database(self) -> sqlite3.Connection:
-        """Establish a connection to the SQLite database.
+        _validated_databases[db_path] = self.db_path
+
+    def connect_to_database(self) -> _Connection:
+        """Return this thread's connection to the SQLite database.
+
+        The connection is taken from the ones left by finished threads, or
+        opened, on first use. It is then reused by every DatabaseManager
+        running in the same thread.
 
         :return: A connection object to the SQLite database.
         :raises: DatabaseError if connection fails
         """
+        connections = getattr(_thread_local, "connections", None)
+        if connections is None:
+            connections = _thread_local.connections = _ThreadConnections()
+        connection = connections.get(self.db_path)
+        if connection is not None:
+            return connection
+
+        with _all_connections_lock:
+            idle = _idle_connections.get(self.db_path)
+            connection = idle.pop() if idle else None
+        if connection is not None:
+            # Its thread may have ended in the middle of a transaction
+            if connection.in_transaction:
+                connection.rollback()
+            connections[self.db_path] = connection
+            return connection
+
         try:
-            connection = sqlite3.connect(self.db_path)
-            connection.execute("PRAGMA foreign_keys = ON;")
-        except sqlite3.OperationalError as e:
-            error_msg = (
-                f"Error connecting to database: {e}\n"
-                f"Database directory: {self.db_path.parent}\n"
-                f"Database path: {self.db_path}\n"
-                f"Directory exists: {self.db_path.parent.exists()}\n"
-                f"Directory permissions: {oct(self.db_path.parent.stat().st_mode)[-3:]}"
+            # Autocommit: every statement is its own transaction unless the
+            # caller opens one with BEGIN, so sqlite3 never has to parse
+            # statements to decide when to begin one implicitly
+            connection = sqlite3.connect(
+                self.db_path,
+                isolation_level=None,
+                check_same_thread=False,
+                factory=_Connection,
+                cached_statements=STATEMENT_CACHE_SIZE,
             )
-            raise DatabaseError(error_msg) from e
+            for pragma in CONNECTION_PRAGMAS:
+                connection.execute(pragma)
+        except sqlite3.OperationalError as e:
+            self._log_connect_error()
+            raise DatabaseError(
+                f"Error connecting to database {self.db_path}: {e}"
+            ) from e
         else:
+            connections[self.db_path] = connection
+            with _all_connections_lock:
+                _all_connections.append(connection)
             return connection
 
-    def execute_select(
-        self, query: str, params: list[Any] | None = None
-    ) -> list[dict[str, Any]]:
-        result = self.__execute_raw_sql(
-            query=query, query_type=QueryType.SELECT, params=params
+    def _log_connect_error(self) -> None:
+        """Log the state of the database directory after a failed connection.
+
+        Inspecting the directory costs filesystem calls, so it is only done
+        when debug logging is enabled.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        directory = self.db_path.parent
+        exists = directory.exists()
+        logger.debug(
+            "Database directory %s exists: %s, permissions: %s",
+            directory,
+            exists,
+            oct(directory.stat().st_mode)[-3:] if exists else "n/a",
         )
-        if not result:
-            raise NoResultFoundError(
-                message="No result found for select query",
-                query=query,
-                params=params or [],
+
+    def set_page_size(self) -> None:
+        """Give a new database file PAGE_SIZE pages.
+
+        SQLite ignores the pragma once the file has content. Changing the page
+        size of an existing file rewrites all of it, so it is left to
+        ``convert_page_size`` instead of being done at startup.
+        """
+        connection = self.connect_to_database()
+        connection.execute(f"PRAGMA page_size = {PAGE_SIZE};")
+        page_size = connection.execute("PRAGMA page_size;").fetchone()[0]
+        if page_size != PAGE_SIZE:
+            logger.info(
+                "Database uses %d-byte pages, run "
+                "`python -m app.database --convert-page-size` to use %d",
+                page_size,
+                PAGE_SIZE,
             )
+
+    def convert_page_size(self) -> None:
+        """Rebuild an existing database file with PAGE_SIZE pages.
+
+        VACUUM cannot change the page size of a WAL database, so the file
+        leaves WAL mode for the rebuild and returns to it afterwards. The
+        whole file is rewritten under an exclusive lock: run it once, with
+        the app stopped.
+        """
+        connection = self.connect_to_database()
+        if connection.execute("PRAGMA page_size;").fetchone()[0] == PAGE_SIZE:
+            logger.info("Database already uses %d-byte pages", PAGE_SIZE)
+            return
+        connection.execute("PRAGMA journal_mode = DELETE;")
+        connection.execute(f"PRAGMA page_size = {PAGE_SIZE};")
+        connection.execute("VACUUM;")
+        self.enable_wal_mode()
+        logger.info("Database converted to %d-byte pages", PAGE_SIZE)
+
+    def enable_wal_mode(self) -> None:
+        """Switch the database file to write-ahead logging.
+
+        The journal mode is persisted in the database file, so this only needs
+        to run once at startup. In-memory databases cannot use WAL.
+        """
+        if str(self.db_path) == ":memory:":
+            return
+        self.connect_to_database().execute("PRAGMA journal_mode = WAL;")
+
+    def optimize(self) -> None:
+        """Let SQLite refresh the query planner statistics that went stale."""
+        self.connect_to_database().execute("PRAGMA optimize;")
+
+    def start_periodic_optimize(self) -> None:
+        """Run ``optimize`` every OPTIMIZE_INTERVAL_SECONDS in a daemon thread.
+
+        Only one thread is started per database file and process.
+        """
+        if self.db_path in _optimized_databases:
+            return
+        _optimized_databases.add(self.db_path)
+
+        def run() -> None:
+            while True:
+                time.sleep(OPTIMIZE_INTERVAL_SECONDS)
+                try:
+                    self.optimize()
+                except sqlite3.Error:
+                    logger.exception("Error optimizing database")
+
+        threading.Thread(target=run, name="sqlite-optimize", daemon=True).start()
+
+    def _run(
+        self,
+        query: str,
+        params: list[Any] | None,
+        fetch: Callable[[sqlite3.Cursor], T],
+    ) -> T:
+        """Execute a statement and return what ``fetch`` reads from its cursor.
+
+        Every single-statement query goes through here, so they are all timed
+        for SLOW_QUERY_MS and their errors are wrapped the same way.
+        """
+        started_ns = time.perf_counter_ns() if SLOW_QUERY_MS is not None else 0
+        try:
+            result = fetch(_execute(self.connect_to_database(), query, params))
+        except Exception as err:
+            raise _query_error(err, query, params) from err
+        if SLOW_QUERY_MS is not None:
+            _log_if_slow(query, started_ns)
         return result
 
-    def execute_insert(self, query: str, params: list[Any] | None = None) -> int:
-        result = self.__execute_raw_sql(
-            query=query, query_type=QueryType.INSERT, params=params or []
-        )
-        if not result:
+    def _row(self, query: str, params: list[Any] | None, kind: str) -> dict[str, Any]:
+        """Run a query that returns rows, and fetch only the first one.
+
+        :raises: NoResultFoundError if there is no row, naming the query kind
+        """
+        row = self._run(query, params, _fetch_first_dict)
+        if row is None:
             raise NoResultFoundError(
-                message="No result found for insert query",
+                message=f"No result found for {kind} query",
                 query=query,
                 params=params or [],
             )
-        return result
+        return row
+
+    def _write(self, query: str, params: list[Any] | None) -> sqlite3.Cursor:
+        """Run a statement that returns no rows, for its rowcount or lastrowid."""
+        return self._run(query, params, lambda cursor: cursor)
+
+    def execute_select(
+        self, query: str, params: list[Any] | None = None
+    ) -> list[dict[str, Any]]:
+        """Execute a SELECT and return its rows, which may be none."""
+        return self._run(query, params, _fetch_dicts)
+
+    def execute_select_one(
+        self, query: str, params: list[Any] | None = None
+    ) -> dict[str, Any]:
+        """Execute a SELECT for a row that must exist and return it.
+
+        :raises: NoResultFoundError if no row matched
+        """
+        return self._row(query, params, "select")
+
+    def execute_insert(self, query: str, params: list[Any] | None = None) -> int:
+        """Execute an INSERT and return the rowid of the inserted row."""
+        return self._write(query, params).lastrowid
 
     def execute_insert_returning(
         self, query: str, params: list[Any] | None = None
     ) -> dict[str, Any]:
-        result = self.__execute_raw_sql(
-            query=query, query_type=QueryType.INSERT_RETURNING, params=params
-        )
-        if not result:
-            raise NoResultFoundError(
-                message="No result found for insert returning query",
-                query=query,
-                params=params or [],
-            )
-        return result
+        """Execute an INSERT ... RETURNING and return the returned row.
+
+        :raises: NoResultFoundError if no row was returned
+        """
+        return self._row(query, params, "insert returning")
 
     def execute_update(self, query: str, params: list[Any] | None = None) -> int:
-        result = self.__execute_raw_sql(
-            query=query, query_type=QueryType.UPDATE, params=params or []
-        )
-        if not result:
-            raise NoResultFoundError(
-                message="No result found for update query",
-                query=query,
-                params=params or [],
-            )
-        return result
+        """Execute a write statement and return the number of rows it changed."""
+        return self._write(query, params).rowcount
 
     def execute_update_returning(
         self, query: str, params: list[Any] | None = None
     ) -> dict[str, Any]:
-        result = self.__execute_raw_sql(
-            query=query, query_type=QueryType.UPDATE_RETURNING, params=params
-        )
-        if not result:
-            raise NoResultFoundError(
-                message="No result found for update returning query",
-                query=query,
-                params=params or [],
-            )
-        return result
+        """Execute an UPDATE ... RETURNING and return the first returned row.
 
-    def execute_delete(self, query: str, params: list[Any] | None = None) -> bool:
-        result = self.__execute_raw_sql(
-            query=query, query_type=QueryType.DELETE, params=params or []
-        )
-        if not result:
-            raise NoResultFoundError(
-                message="No result found for delete query",
-                query=query,
-                params=params or [],
-            )
-        return result
+        :raises: NoResultFoundError if no row was updated
+        """
+        return self._row(query, params, "update returning")
 
-    def __execute_raw_sql(
-        self,
-        query: str,
-        query_type: QueryType,
-        params: list[Any] | None = None,
-    ) -> Any:
-        """Execute a raw SQL query and return the results.
-
-        :param query: The SQL query to execute.
-        :param query_type: The type of query to execute.
-        :param params: Optional parameters for the SQL query.
-        :return: The results of the query, or the last row ID for insert operations.
+    def execute_delete(self, query: str, params: list[Any] | None = None) -> int:
+        """Execute a DELETE and return the number of rows it removed."""
+        return self._write(query, params).rowcount
+
+    def execute_many(self, query: str, seq_of_params: Iterable[Sequence[Any]]) -> int:
+        """Execute one statement for every parameter set, in a single transaction.
+
+        :param query: The SQL statement to execute.
+        :param seq_of_params: One parameter sequence per execution.
+        :return: The total number of rows modified.
+        :raises: QueryExecutionError if any execution fails; nothing is committed
         """
-        with self.connect_to_database() as connection:
-            connection.row_factory = sqlite3.Row
-            cursor = connection.cursor()
+        connection = self.connect_to_database()
+        try:
+            with self.transaction():
+                cursor = connection.executemany(query, seq_of_params)
+        except Exception as err:
+            raise _query_error(err, query, []) from err
+        return cursor.rowcount
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run the queries issued inside the block in one write transaction.
+
+        The transaction is committed when the block exits and rolled back if
+        it raises. Inside a transaction that is already open, the block runs
+        in a savepoint instead: a failure only undoes the block, and
+        committing is left to the outer transaction.
+        """
+        connection = self.connect_to_database()
+        if connection.in_transaction:
+            connection.execute("SAVEPOINT nested")
             try:
-                if params:
-                    # Convert tuple to list if necessary
-                    params_list = list(params) if isinstance(params, tuple) else params
-                    cursor.execute(query, params_list)
-                else:
-                    cursor.execute(query)
-
-                if query_type == QueryType.SELECT:
-                    results = cursor.fetchall()
-                    return [dict(row) for row in results]
-
-                if query_type == QueryType.INSERT:
-                    connection.commit()
-                    return cursor.lastrowid
-
-                if query_type == QueryType.INSERT_RETURNING:
-                    result = cursor.fetchall()
-                    connection.commit()
-                    return dict(result[0])
-
-                if query_type == QueryType.UPDATE:
-                    connection.commit()
-                    return cursor.lastrowid
-
-                if query_type == QueryType.UPDATE_RETURNING:
-                    result = cursor.fetchall()
-                    connection.commit()
-                    return dict(result[0])
-
-                if query_type == QueryType.DELETE:
-                    connection.commit()
-                    return True
-
-            except Exception as err:
-                raise QueryExecutionError(
-                    message=f"Error executing query: {err}",
-                    query=query,
-                    params=params or [],
-                ) from err
-            finally:
-                cursor.close()
+                yield
+            except BaseException:
+                connection.execute("ROLLBACK TO nested")
+                connection.execute("RELEASE nested")
+                raise
+            connection.execute("RELEASE nested")
+            return
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            connection.rollback()
+            raise
+        connection.execute("COMMIT")
 
     def create_tables(self) -> None:
         """Create the necessary tables, views, triggers and indexes in the database if they do not exist."""
-        tables = [
-            """--sql
-                CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        email TEXT UNIQUE NOT NULL,
-                        password TEXT NOT NULL,
-                        last_login TIMESTAMP);
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS banks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    website TEXT,
-                    UNIQUE(user_id, name),
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                );
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS accounts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    type TEXT NOT NULL CHECK (type IN (
-                        'investment', 'income', 'expense', 'checking', 'savings', 'loan'
-                    )),
-                    bank_id INTEGER NOT NULL,
-                    UNIQUE(user_id, bank_id, name, type),
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY (bank_id) REFERENCES banks(id) ON DELETE CASCADE
-                );
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS transactions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    date TIMESTAMP NOT NULL,
-                    date_accountability TIMESTAMP NOT NULL,
-                    description TEXT NOT NULL,
-                    amount DECIMAL(10,2) NOT NULL CHECK (amount > 0),
-                    from_account_id INTEGER NOT NULL,
-                    to_account_id INTEGER NOT NULL,
-                    category TEXT NOT NULL,
-                    subcategory TEXT,
-                    type TEXT NOT NULL CHECK (type IN (
-                        'expense', 'income', 'transfer'
-                    )),
-                    is_investment BOOLEAN DEFAULT FALSE,
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-                    FOREIGN KEY (from_account_id) REFERENCES accounts(id) ON DELETE CASCADE,
-                    FOREIGN KEY (to_account_id) REFERENCES accounts(id) ON DELETE CASCADE
-                );
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS investment_details (
-                    transaction_id INTEGER PRIMARY KEY,
-                    asset_id INTEGER NOT NULL,
-                    quantity DECIMAL(10,6) NOT NULL,
-                    unit_price DECIMAL(10,2) NOT NULL,
-                    fee DECIMAL(10,2) NOT NULL,
-                    tax DECIMAL(10,2) NOT NULL,
-                    total_paid DECIMAL(10,2),
-                    investment_type TEXT NOT NULL CHECK (investment_type IN (
-                        'Buy', 'Sell', 'Dividend', 'Interest', 'Deposit', 'Withdrawal'
-                    )),
-                    FOREIGN KEY (transaction_id) REFERENCES transactions(id) ON DELETE CASCADE,
-                    FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
-                );
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS assets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    symbol TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    UNIQUE(symbol, user_id)
-                    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-                );
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS stock_cache (
-                    symbol TEXT NOT NULL,
-                    cache_type TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    last_updated TEXT NOT NULL,
-                    PRIMARY KEY (symbol, cache_type)
-                );
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS refund_groups (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS refund_items (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    income_transaction_id INTEGER NOT NULL,
-                    expense_transaction_id INTEGER NOT NULL,
-                    amount REAL NOT NULL,
-                    refund_group_id INTEGER,
-                    description TEXT,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                    FOREIGN KEY (income_transaction_id) REFERENCES transactions (id) ON DELETE CASCADE,
-                    FOREIGN KEY (expense_transaction_id) REFERENCES transactions (id) ON DELETE CASCADE,
-                    FOREIGN KEY (refund_group_id) REFERENCES refund_groups (id) ON DELETE CASCADE
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS gocardless_requisitions (
-                    requisition_id TEXT PRIMARY KEY,
-                    link TEXT NOT NULL,
-                    user_id INTEGER NOT NULL,
-                    institution_id TEXT NOT NULL,
-                    reference TEXT,
-                    agreement_id TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                    FOREIGN KEY (agreement_id) REFERENCES gocardless_agreements (agreement_id) ON DELETE SET NULL
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS gocardless_accounts (
-                    account_id TEXT PRIMARY KEY,
-                    created_at TEXT NOT NULL,
-                    last_accessed TEXT NOT NULL,
-                    iban TEXT,
-                    institution_id TEXT NOT NULL,
-                    status TEXT,
-                    owner_name TEXT,
-                    currency TEXT,
-                    balance REAL,
-                    account_type TEXT,
-                    user_id INTEGER NOT NULL,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS gocardless_cache (
-                    cache_key TEXT NOT NULL,
-                    cache_type TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    last_updated TEXT NOT NULL,
-                    PRIMARY KEY (cache_key, cache_type)
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS gocardless_agreements (
-                    agreement_id TEXT PRIMARY KEY,
-                    institution_id TEXT NOT NULL,
-                    max_historical_days INTEGER NOT NULL,
-                    access_valid_for_days INTEGER NOT NULL,
-                    access_scope TEXT NOT NULL,
-                    user_id INTEGER NOT NULL,
-                    created_at TEXT NOT NULL,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS custom_prices (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    open DECIMAL(10,4) NOT NULL,
-                    high DECIMAL(10,4) NOT NULL,
-                    low DECIMAL(10,4) NOT NULL,
-                    close DECIMAL(10,4) NOT NULL,
-                    volume INTEGER DEFAULT 0,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    user_id INTEGER NOT NULL,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS budgets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    category TEXT NOT NULL,
-                    year INTEGER NOT NULL,
-                    month INTEGER NOT NULL,
-                    amount DECIMAL(10,2) NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                    UNIQUE(user_id, category, year, month)
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS liabilities (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    liability_type TEXT NOT NULL CHECK (liability_type IN (
-                        'standard_loan', 'partial_deferred_loan', 'total_deferred_loan',
-                        'mortgage', 'credit_card', 'line_of_credit', 'other'
-                    )),
-                    principal_amount DECIMAL(10,2) NOT NULL,
-                    interest_rate DECIMAL(5,3) NOT NULL,
-                    start_date TIMESTAMP NOT NULL,
-                    end_date TIMESTAMP,
-                    compounding_period TEXT NOT NULL CHECK (compounding_period IN (
-                        'daily', 'monthly', 'quarterly', 'annually'
-                    )),
-                    payment_frequency TEXT NOT NULL CHECK (payment_frequency IN (
-                        'weekly', 'bi-weekly', 'monthly', 'quarterly', 'annually'
-                    )),
-                    payment_amount DECIMAL(10,2),
-                    deferral_period_months INTEGER DEFAULT 0,
-                    deferral_type TEXT CHECK (deferral_type IN (
-                        'none', 'partial', 'total'
-                    )),
-                    direction TEXT NOT NULL CHECK (direction IN (
-                        'i_owe', 'they_owe'
-                    )),
-                    account_id INTEGER,
-                    lender_name TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                    FOREIGN KEY (account_id) REFERENCES accounts (id) ON DELETE SET NULL
-                )
-            """,
-            """--sql
-                CREATE TABLE IF NOT EXISTS liability_payment_details (
-                    transaction_id INTEGER PRIMARY KEY,
-                    user_id INTEGER NOT NULL,
-                    liability_id INTEGER NOT NULL,
-                    payment_date TIMESTAMP NOT NULL,
-                    amount DECIMAL(10,2) NOT NULL,
-                    principal_amount DECIMAL(10,2) NOT NULL,
-                    interest_amount DECIMAL(10,2) NOT NULL,
-                    extra_payment DECIMAL(10,2) DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE,
-                    FOREIGN KEY (liability_id) REFERENCES liabilities (id) ON DELETE CASCADE,
-                    FOREIGN KEY (transaction_id) REFERENCES transactions (id) ON DELETE CASCADE
-                )
-            """,
-        ]
-
-        views = [
-            """--sql
-                CREATE VIEW IF NOT EXISTS account_balances AS
-                SELECT
-                    a.id as account_id,
-                    a.user_id,
-                    a.name as account_name,
-                    a.type as account_type,
-                    COALESCE(
-                        (SELECT SUM(
-                            CASE
-                                WHEN from_account_id = a.id THEN -amount
-                                WHEN to_account_id = a.id THEN amount
-                            END
-                        )
-                        FROM transactions
-                        WHERE from_account_id = a.id OR to_account_id = a.id
-                        ), 0
-                    ) as current_balance
-                FROM accounts a
-                GROUP BY a.id, a.user_id, a.name, a.type;
-            """,
-            """--sql
-                CREATE VIEW IF NOT EXISTS asset_balances AS
-                SELECT
-                    t.user_id,
-                    i.asset_id,
-                    a.symbol,
-                    a.name as asset_name,
-                    SUM(
-                        CASE
-                            WHEN i.investment_type IN ('Buy', 'Deposit') THEN i.quantity
-                            WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN -i.quantity
-                            ELSE 0
-                        END
-                    ) as quantity,
-                    MAX(t.date) as last_transaction_date
-                FROM investment_details i
-                JOIN transactions t ON i.transaction_id = t.id
-                JOIN assets a ON i.asset_id = a.id
-                GROUP BY t.user_id, i.asset_id, a.symbol, a.name
-                HAVING quantity > 0;
-            """,
-            """--sql
-                CREATE VIEW IF NOT EXISTS liability_balances AS
-                SELECT
-                    l.id as liability_id,
-                    l.user_id,
-                    l.name as liability_name,
-                    l.liability_type,
-                    l.principal_amount,
-                    l.interest_rate,
-                    l.direction,
-                    l.start_date,
-                    l.end_date,
-                    COALESCE(
-                        (SELECT SUM(principal_amount)
-                        FROM liability_payment_details
-                        WHERE liability_id = l.id
-                        ), 0
-                    ) as principal_paid,
-                    COALESCE(
-                        (SELECT SUM(interest_amount)
-                        FROM liability_payment_details
-                        WHERE liability_id = l.id
-                        ), 0
-                    ) as interest_paid,
-                    l.principal_amount - COALESCE(
-                        (SELECT SUM(principal_amount)
-                        FROM liability_payment_details
-                        WHERE liability_id = l.id
-                        ), 0
-                    ) as remaining_balance,
-                    0 as missed_payments_count,
-                    NULL as next_payment_date
-                FROM liabilities l
-                GROUP BY l.id, l.user_id, l.name, l.liability_type, l.principal_amount, l.interest_rate, l.direction, l.start_date, l.end_date;
-            """,
-            """--sql
-                CREATE VIEW IF NOT EXISTS asset_balances_by_account AS
-                SELECT
-                    t.user_id,
-                    CASE
-                        WHEN i.investment_type IN ('Buy', 'Deposit') THEN t.to_account_id
-                        WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN t.from_account_id
-                    END as account_id,
-                    acc.name as account_name,
-                    acc.type as account_type,
-                    i.asset_id,
-                    a.symbol,
-                    a.name as asset_name,
-                    SUM(
-                        CASE
-                            WHEN i.investment_type IN ('Buy', 'Deposit') THEN i.quantity
-                            WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN -i.quantity
-                            ELSE 0
-                        END
-                    ) as quantity,
-                    MAX(t.date) as last_transaction_date
-                FROM investment_details i
-                JOIN transactions t ON i.transaction_id = t.id
-                JOIN assets a ON i.asset_id = a.id
-                JOIN accounts acc ON (
-                    (i.investment_type IN ('Buy', 'Deposit') AND acc.id = t.to_account_id) OR
-                    (i.investment_type IN ('Sell', 'Withdrawal') AND acc.id = t.from_account_id)
-                )
-                GROUP BY
-                    t.user_id,
-                    CASE
-                        WHEN i.investment_type IN ('Buy', 'Deposit') THEN t.to_account_id
-                        WHEN i.investment_type IN ('Sell', 'Withdrawal') THEN t.from_account_id
-                    END,
-                    acc.name,
-                    acc.type,
-                    i.asset_id,
-                    a.symbol,
-                    a.name
-                HAVING quantity > 0;
-            """,
-        ]
-
-        triggers = [
-            """--sql
-            CREATE TRIGGER IF NOT EXISTS trg_validate_transaction
-            BEFORE INSERT ON transactions
-            BEGIN
-                -- Get account types for validation
-                WITH account_types AS (
-                    SELECT
-                        NEW.from_account_id as account_id,
-                        type as from_type,
-                        (SELECT type FROM accounts WHERE id = NEW.to_account_id) as to_type
-                    FROM accounts
-                    WHERE id = NEW.from_account_id
-                )
-                SELECT
-                    CASE
-                        -- Validate income transactions
-                        WHEN NEW.type = 'income' AND (
-                            (SELECT to_type FROM account_types) NOT IN (
-                                'checking', 'savings', 'investment', 'loan'
-                            )
-                        ) THEN
-                            RAISE(ABORT, 'Income cannot be received in this type of account')
-                        WHEN NEW.type = 'income' AND (
-                            (SELECT from_type FROM account_types) != 'income'
-                        ) THEN
-                            RAISE(ABORT, 'Income must originate from an income account')
-
-                        -- Validate expense transactions
-                        WHEN NEW.type = 'expense' AND (
-                            (SELECT from_type FROM account_types) NOT IN (
-                                'checking', 'savings', 'investment', 'loan'
-                            )
-                        ) THEN
-                            RAISE(ABORT, 'Expenses cannot be paid from this type of account')
-                        WHEN NEW.type = 'expense' AND (
-                            (SELECT to_type FROM account_types) != 'expense'
-                        ) THEN
-                            RAISE(ABORT, 'Expenses must go to an expense account')
-
-                        -- Validate transfer transactions
-                        WHEN NEW.type = 'transfer' AND (
-                            (SELECT from_type FROM account_types) NOT IN (
-                                'checking', 'savings', 'investment', 'loan'
-                            )
-                        ) THEN
-                            RAISE(ABORT, 'Cannot transfer from this type of account')
-                        WHEN NEW.type = 'transfer' AND (
-                            (SELECT to_type FROM account_types) NOT IN (
-                                'checking', 'savings', 'investment', 'loan'
-                            )
-                        ) THEN
-                            RAISE(ABORT, 'Cannot transfer to this type of account')
-                    END;
-            END;
+        if self.db_path in _initialized_databases:
+            return
 
-            """,
-            """--sql
-                CREATE TRIGGER IF NOT EXISTS trg_validate_account_bank_ownership_insert
-                BEFORE INSERT ON accounts
-                BEGIN
-                    SELECT CASE
-                        WHEN (
-                            SELECT user_id
-                            FROM banks
-                            WHERE id = NEW.bank_id
-                        ) != NEW.user_id
-                        THEN RAISE(ABORT, 'Cannot insert account with bank owned by different user')
-                    END;
-                END;
-            """,
-            """--sql
-                CREATE TRIGGER IF NOT EXISTS trg_validate_account_bank_ownership_update
-                BEFORE UPDATE ON accounts
-                WHEN NEW.bank_id != OLD.bank_id
-                BEGIN
-                    SELECT CASE
-                        WHEN (
-                            SELECT user_id
-                            FROM banks
-                            WHERE id = NEW.bank_id
-                        ) != NEW.user_id
-                        THEN RAISE(ABORT, 'Cannot update account to use bank owned by different user')
-                    END;
-                END;
-            """,
-            """--sql
-                CREATE TRIGGER IF NOT EXISTS trg_validate_transaction_account_ownership_insert
-                BEFORE INSERT ON transactions
-                BEGIN
-                    SELECT CASE
-                        WHEN (
-                            SELECT user_id
-                            FROM accounts
-                            WHERE id = NEW.from_account_id
-                        ) != NEW.user_id OR
-                        (
-                            SELECT user_id
-                            FROM accounts
-                            WHERE id = NEW.to_account_id
-                        ) != NEW.user_id
-                        THEN RAISE(ABORT, 'Cannot insert transaction with accounts owned by different user')
-                    END;
-                END;
-            """,
-            """--sql
-                CREATE TRIGGER IF NOT EXISTS trg_validate_transaction_account_ownership_update
-                BEFORE UPDATE ON transactions
-                WHEN NEW.from_account_id != OLD.from_account_id OR NEW.to_account_id != OLD.to_account_id
-                BEGIN
-                    SELECT CASE
-                        WHEN (
-                            SELECT user_id
-                            FROM accounts
-                            WHERE id = NEW.from_account_id
-                        ) != NEW.user_id OR
-                        (
-                            SELECT user_id
-                            FROM accounts
-                            WHERE id = NEW.to_account_id
-                        ) != NEW.user_id
-                        THEN RAISE(ABORT, 'Cannot update transaction to use accounts owned by different user')
-                    END;
-                END;
-            """,
-        ]
-
-        indexes = [
-            # Users table - email is used for login/authentication
-            "CREATE INDEX IF NOT EXISTS idx_banks_user_id ON banks(user_id);",
-            "CREATE INDEX IF NOT EXISTS idx_accounts_user_type ON accounts(user_id, type);",
-            "CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions(user_id, date);",
-            "CREATE INDEX IF NOT EXISTS idx_transactions_user_date_acc ON transactions(user_id, date_accountability);",
-            "CREATE INDEX IF NOT EXISTS idx_transactions_accounts ON transactions(from_account_id, to_account_id);",
-            "CREATE INDEX IF NOT EXISTS idx_gocardless_requisitions_user ON gocardless_requisitions(user_id);",
-            "CREATE INDEX IF NOT EXISTS idx_gocardless_accounts_user ON gocardless_accounts(user_id);",
-            "CREATE INDEX IF NOT EXISTS idx_gocardless_accounts_institution ON gocardless_accounts(institution_id);",
-            "CREATE INDEX IF NOT EXISTS idx_gocardless_agreements_user ON gocardless_agreements(user_id);",
-            "CREATE INDEX IF NOT EXISTS idx_gocardless_agreements_institution ON gocardless_agreements(institution_id);",
-            "CREATE INDEX IF NOT EXISTS idx_liabilities_user ON liabilities(user_id);",
-            "CREATE INDEX IF NOT EXISTS idx_liabilities_type ON liabilities(liability_type);",
-            "CREATE INDEX IF NOT EXISTS idx_liability_payment_details_liability ON liability_payment_details(liability_id);",
-            "CREATE INDEX IF NOT EXISTS idx_liability_payment_details_user ON liability_payment_details(user_id);",
-            "CREATE INDEX IF NOT EXISTS idx_liability_payment_details_date ON liability_payment_details(payment_date);",
-        ]
-
-        with self.connect_to_database() as connection:
-            cursor = connection.cursor()
-            try:
-                # Create tables
-                for table in tables:
-                    self.execute_delete(table)
-
-                # Create views
-                for view in views:
-                    self.execute_delete(view)
-
-                # Create triggers
-                for trigger in triggers:
-                    self.execute_delete(trigger)
-
-                # Create indexes
-                for index in indexes:
-                    self.execute_delete(index)
-
-                connection.commit()
-                print("Tables, views, triggers and indexes created successfully")
-            except Exception as e:
-                print(f"Error creating tables, views, triggers or indexes: {e}")
+        connection = self.connect_to_database()
+        if connection.execute("PRAGMA user_version;").fetchone()[0] == _SCHEMA_VERSION:
+            _initialized_databases.add(self.db_path)
+            return
+
+        # account_balances used to be a view, which has to be dropped before
+        # the table of the same name can be created
+        legacy_view = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = ?",
+            ("account_balances",),
+        ).fetchone()
+        script = _SCHEMA_SCRIPT
+        if legacy_view:
+            script = f"DROP VIEW account_balances;\n{script}"
+
+        self._rebuild_transactions_table(connection)
+
+        try:
+            # One transaction for the whole schema. IMMEDIATE takes the write
+            # lock up front, so workers booting together simply wait in turn.
+            # Foreign keys of the seeded rows are checked once, at COMMIT
+            connection.executescript(
+                f"BEGIN IMMEDIATE;\nPRAGMA defer_foreign_keys = ON;\n{script}\n"
+                f"PRAGMA user_version = {_SCHEMA_VERSION};\nCOMMIT;"
+            )
+            _initialized_databases.add(self.db_path)
+            logger.info("Tables, views, triggers and indexes created successfully")
+        except Exception:
+            logger.exception("Error creating tables, views, triggers or indexes")
+            if connection.in_transaction:
                 connection.rollback()
-                raise
-            finally:
-                cursor.close()
+            raise
+
+    def _rebuild_transactions_table(self, connection: _Connection) -> None:
+        """Recreate an existing transactions table with the current foreign keys.
 
-    def update_user_login(self, user_id: int, current_password: str) -> None:
-        """Update user's last login time via trigger.
+        Tables created before the foreign keys referenced accounts(id, user_id)
+        relied on triggers to check account ownership. SQLite cannot add a
+        constraint to a table, so the rows are copied to a new one, following
+        https://www.sqlite.org/lang_altertable.html#otheralter. Foreign keys
+        are off meanwhile so dropping the old table does not cascade into
+        investment_details, refund_items and liability_payment_details. The
+        schema script then recreates the indexes and triggers of the table.
+        """
+        table = connection.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            ("transactions",),
+        ).fetchone()
+        if table is None or "REFERENCES accounts(id, user_id)" in table[0]:
+            return
+
+        columns = ", ".join(
+            row[1] for row in connection.execute("PRAGMA table_info(transactions);")
+        )
+        connection.execute("PRAGMA foreign_keys = OFF;")
+        try:
+            connection.executescript(
+                f"""--sql
+                BEGIN IMMEDIATE;
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_accounts_id_user
+                    ON accounts(id, user_id);
+                CREATE TABLE transactions_new {_TRANSACTIONS_COLUMNS};
+                INSERT INTO transactions_new ({columns})
+                    SELECT {columns} FROM transactions;
+                UPDATE sqlite_sequence
+                    SET seq = (
+                        SELECT seq FROM sqlite_sequence WHERE name = 'transactions'
+                    )
+                    WHERE name = 'transactions_new';
+                DROP TABLE transactions;
+                PRAGMA legacy_alter_table = ON;
+                ALTER TABLE transactions_new RENAME TO transactions;
+                COMMIT;
+                """  # noqa: S608
+            )
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.rollback()
+            raise
+        finally:
+            connection.execute("PRAGMA legacy_alter_table = OFF;")
+            connection.execute("PRAGMA foreign_keys = ON;")
+
+    def update_user_login(self, user_id: int) -> None:
+        """Set a user's last login time to now.
 
         :param user_id: The ID of the user who is logging in
-        :param current_password: The user's current password (for trigger condition)
         """
         self.execute_update(
-            query="UPDATE users SET password = ? WHERE id = ? AND password = ?",
-            params=[current_password, user_id, current_password],
+            query="UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE id = ?",
+            params=[user_id],
         )
 
 
 if __name__ == "__main__":
-    print("Creating tables, views, triggers and indexes")
+    parser = argparse.ArgumentParser(description="Create or upgrade the database.")
+    parser.add_argument(
+        "--convert-page-size",
+        action="store_true",
+        help=f"rebuild an existing database with {PAGE_SIZE}-byte pages first",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
     db = DatabaseManager()
+    if args.convert_page_size:
+        db.convert_page_size()
+    logger.info("Creating tables, views, triggers and indexes")
     db.create_tables()
@@ -1,19 +1,54 @@
 import logging
+import os
 import sys
+import time
 
 from pythonjsonlogger import jsonlogger
 
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that runs strftime at most once per second of timestamps."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._time_cache: tuple[int, str | None, str] = (-1, None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        second = int(record.created)
+        cached_second, cached_datefmt, formatted = self._time_cache
+        if second != cached_second or datefmt != cached_datefmt:
+            formatted = time.strftime(
+                datefmt or self.default_time_format, self.converter(record.created)
+            )
+            self._time_cache = (second, datefmt, formatted)
+        if datefmt:
+            return formatted
+        return self.default_msec_format % (formatted, record.msecs)
+
+
+def configure_root_logger() -> None:
+    """Configure the root logger level and format from the environment."""
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        CachedTimeFormatter("%(asctime)s - %(levelname)s - %(message)s")
+    )
+    logging.basicConfig(level=LOG_LEVEL, handlers=[handler])
+
 
 def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    # The logger level (not only the handler level) must match what is emitted,
+    # so that isEnabledFor() lets callers skip building discarded records
+    logger.setLevel(LOG_LEVEL)
 
     # Prevent duplicate logs
     if logger.handlers:
         return logger
 
     # JSON formatter for structured logging
-    class CustomJsonFormatter(jsonlogger.JsonFormatter):
+    class CustomJsonFormatter(CachedTimeFormatter, jsonlogger.JsonFormatter):
         def add_fields(
             self, log_record: dict, record: logging.LogRecord, message_dict: dict
         ) -> None:
@@ -29,7 +64,7 @@ def setup_logger(name: str) -> logging.Logger:
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(logger.level)
     console_formatter = CustomJsonFormatter(
         "%(timestamp)s %(level)s %(name)s %(message)s"
     )
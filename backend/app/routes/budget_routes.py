@@ -1,18 +1,19 @@
 from datetime import datetime, timedelta
 from typing import TypedDict
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
 from app.swagger import spec
 
 from ..category import (
-    expense_categories,
-    income_categories,
-    transfer_categories,
+    ALL_CATEGORIES_JSON,
+    CATEGORIES_JSON_BY_TYPE,
+    ENABLED_LANGUAGES,
+    categories_etag,
+    localized_categories_json,
 )
 from ..database import DatabaseManager
-from ..exceptions import NoResultFoundError
 from ..services.budget_service import (
     TransactionSummary,
     calculate_period_boundaries,
@@ -92,6 +93,15 @@ def register_budget_swagger_docs():
             "get": {
                 "tags": ["Budget"],
                 "summary": "Get all available categories grouped by type",
+                "parameters": [
+                    {
+                        "name": "lang",
+                        "in": "query",
+                        "required": False,
+                        "schema": {"type": "string", "enum": ["fr", "en"]},
+                        "description": "Only return names in this language",
+                    }
+                ],
                 "responses": {
                     "200": {
                         "description": "Categories grouped by type",
@@ -139,7 +149,14 @@ def register_budget_swagger_docs():
                             "enum": ["expense", "income", "transfer"],
                         },
                         "description": "Type of categories to retrieve",
-                    }
+                    },
+                    {
+                        "name": "lang",
+                        "in": "query",
+                        "required": False,
+                        "schema": {"type": "string", "enum": ["fr", "en"]},
+                        "description": "Only return names in this language",
+                    },
                 ],
                 "responses": {
                     "200": {
@@ -150,7 +167,7 @@ def register_budget_swagger_docs():
                             }
                         },
                     },
-                    "400": {"description": "Invalid category type"},
+                    "400": {"description": "Invalid category type or language"},
                 },
             }
         },
@@ -440,31 +457,42 @@ def budget_summary():
 @budget_bp.route("/categories", methods=["GET"])
 def get_all_categories():
     """Return all available categories grouped by type (expense, income, transfer)"""
-    categories = {
-        "expense": expense_categories,
-        "income": income_categories,
-        "transfer": transfer_categories,
-    }
-    return jsonify(categories)
+    return _categories_response(ALL_CATEGORIES_JSON, None)
 
 
 @budget_bp.route("/categories/<category_type>", methods=["GET"])
 def get_categories_by_type(category_type: str):
     """Return categories for a specific type (expense, income, or transfer)"""
-    if category_type not in ["expense", "income", "transfer"]:
+    categories_json = CATEGORIES_JSON_BY_TYPE.get(category_type)
+    if categories_json is None:
         return jsonify(
             {
                 "error": "Invalid category type. Must be one of: expense, income, transfer"
             }
         ), 400
 
-    category_map = {
-        "expense": expense_categories,
-        "income": income_categories,
-        "transfer": transfer_categories,
-    }
+    return _categories_response(categories_json, category_type)
 
-    return jsonify(category_map[category_type])
+
+def _categories_response(categories_json: bytes, category_type: str | None):
+    """Return the bilingual categories, or their projection on the ?lang= language"""
+    lang = request.args.get("lang")
+    if lang is not None:
+        if lang not in ENABLED_LANGUAGES:
+            return jsonify(
+                {
+                    "error": "Invalid language. Must be one of: "
+                    + ", ".join(ENABLED_LANGUAGES)
+                }
+            ), 400
+        categories_json = localized_categories_json(category_type, lang)
+
+    # Categories only change with a deploy, so clients can revalidate with a 304
+    response = Response(categories_json, mimetype="application/json")
+    response.set_etag(categories_etag(categories_json))
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response.make_conditional(request)
 
 
 @budget_bp.route("/categories/summary", methods=["GET"])
@@ -642,16 +670,13 @@ def create_budget():
         SELECT id FROM budgets
         WHERE user_id = ? AND category = ? AND year = ? AND month = ?
     """
-    try:
-        existing = db.execute_select(
-            query=check_query, params=[user_id, data["category"], year, month]
-        )
-        if existing:
-            return jsonify(
-                {"error": "Budget for this category and period already exists"}
-            ), 409
-    except NoResultFoundError:
-        pass
+    existing = db.execute_select(
+        query=check_query, params=[user_id, data["category"], year, month]
+    )
+    if existing:
+        return jsonify(
+            {"error": "Budget for this category and period already exists"}
+        ), 409
 
     # Insert the new budget
     insert_query = """--sql
@@ -677,11 +702,8 @@ def update_budget(budget_id):
         SELECT id FROM budgets
         WHERE id = ? AND user_id = ?
     """
-    try:
-        existing = db.execute_select(query=check_query, params=[budget_id, user_id])
-        if not existing:
-            return jsonify({"error": "Budget not found or not authorized"}), 404
-    except NoResultFoundError:
+    existing = db.execute_select(query=check_query, params=[budget_id, user_id])
+    if not existing:
         return jsonify({"error": "Budget not found or not authorized"}), 404
 
     # Validate amount
@@ -717,11 +739,8 @@ def delete_budget(budget_id):
         SELECT id FROM budgets
         WHERE id = ? AND user_id = ?
     """
-    try:
-        existing = db.execute_select(query=check_query, params=[budget_id, user_id])
-        if not existing:
-            return jsonify({"error": "Budget not found or not authorized"}), 404
-    except NoResultFoundError:
+    existing = db.execute_select(query=check_query, params=[budget_id, user_id])
+    if not existing:
         return jsonify({"error": "Budget not found or not authorized"}), 404
 
     # Delete the budget
@@ -763,10 +782,7 @@ def get_budgets():
 
     # Execute query
     db = DatabaseManager()
-    try:
-        budgets = db.execute_select(query=query, params=params)
-    except NoResultFoundError:
-        return jsonify([]), 200
+    budgets = db.execute_select(query=query, params=params)
 
     return jsonify(budgets), 200
 
@@ -807,10 +823,7 @@ def compare_budget_with_actual():
         WHERE user_id = ? AND year = ? AND month = ?
     """
 
-    try:
-        budgets = db.execute_select(budget_query, [user_id, year, month])
-    except NoResultFoundError:
-        budgets = []
+    budgets = db.execute_select(budget_query, [user_id, year, month])
 
     # Get actual spending for the month
     expense_query = """--sql
@@ -835,10 +848,7 @@ def compare_budget_with_actual():
         GROUP BY t.category
     """
 
-    try:
-        expenses = db.execute_select(expense_query, [user_id, start_date, end_date])
-    except NoResultFoundError:
-        expenses = []
+    expenses = db.execute_select(expense_query, [user_id, start_date, end_date])
 
     # Create a map of expenses by category
     expense_map = {expense["category"]: expense["net_amount"] for expense in expenses}
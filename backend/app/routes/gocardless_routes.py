@@ -1,6 +1,7 @@
 # from unittest.mock import Mock
 
 import logging
+from threading import Lock
 from typing import Any
 
 from flask import Blueprint, jsonify, request
@@ -10,18 +11,35 @@ from app.services.gocardless_service import GoCardlessService
 from app.swagger import spec
 
 gocardless_bp = Blueprint("gocardless", __name__)
-gocardless_service = GoCardlessService()
-# gocardless_service = Mock()
 logger = logging.getLogger(__name__)
 
 
+_gocardless_service: GoCardlessService | None = None
+_gocardless_service_lock = Lock()
+
+
+def get_gocardless_service() -> GoCardlessService:
+    """Create the GoCardless client on first use instead of at import time.
+
+    Building it requests an API token, a network round trip every worker would
+    otherwise pay at startup even when no bank is ever synced.
+    """
+    global _gocardless_service  # noqa: PLW0603
+    # Locked so that concurrent first requests cannot each build one
+    if _gocardless_service is None:
+        with _gocardless_service_lock:
+            if _gocardless_service is None:
+                _gocardless_service = GoCardlessService()
+    return _gocardless_service
+
+
 @gocardless_bp.route("/institutions", methods=["GET"])
 @jwt_required()
 def get_institutions() -> dict[str, Any] | tuple:
     """Get list of available banks."""
     try:
         country_code = request.args.get("country", "GB")
-        institutions = gocardless_service.get_institutions(country_code)
+        institutions = get_gocardless_service().get_institutions(country_code)
         return jsonify(institutions)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -32,7 +50,7 @@ def get_institutions() -> dict[str, Any] | tuple:
 def get_institution(institution_id: str) -> dict[str, Any] | tuple:
     """Get details of a specific bank."""
     try:
-        institution = gocardless_service.get_institution(institution_id)
+        institution = get_gocardless_service().get_institution(institution_id)
         return jsonify(institution)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -53,7 +71,7 @@ def create_end_user_agreement() -> dict[str, Any] | tuple:
         access_scope = data.get("access_scope", ["balances", "details", "transactions"])
 
         user_id = get_jwt_identity()
-        agreement = gocardless_service.create_end_user_agreement(
+        agreement = get_gocardless_service().create_end_user_agreement(
             institution_id,
             max_historical_days,
             access_valid_for_days,
@@ -84,7 +102,7 @@ def create_requisition() -> dict[str, Any] | tuple:
         account_selection = data.get("account_selection", False)
 
         user_id = get_jwt_identity()
-        requisition = gocardless_service.create_requisition(
+        requisition = get_gocardless_service().create_requisition(
             institution_id,
             redirect_url,
             user_id,
@@ -101,7 +119,7 @@ def create_requisition() -> dict[str, Any] | tuple:
 def get_requisition_status(requisition_id: str) -> dict[str, Any] | tuple:
     """Get status of a requisition by ID."""
     try:
-        status = gocardless_service.get_requisition_status(requisition_id)
+        status = get_gocardless_service().get_requisition_status(requisition_id)
         return jsonify(status)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -113,7 +131,7 @@ def get_requisition_by_reference(reference: str) -> dict[str, Any] | tuple:
     """Get requisition by reference value and store account information."""
     try:
         user_id = get_jwt_identity()
-        requisition = gocardless_service.get_requisition_by_reference(
+        requisition = get_gocardless_service().get_requisition_by_reference(
             reference, user_id
         )
 
@@ -123,7 +141,7 @@ def get_requisition_by_reference(reference: str) -> dict[str, Any] | tuple:
                 # Get accounts details and store them
                 requisition_id = requisition.get("id")
                 account_ids = requisition.get("accounts", [])
-                gocardless_service.link_accounts_to_user(
+                get_gocardless_service().link_accounts_to_user(
                     requisition_id, account_ids, user_id
                 )
             except Exception as e:
@@ -175,7 +193,7 @@ def get_requisition_by_reference(reference: str) -> dict[str, Any] | tuple:
 def get_accounts(requisition_id: str) -> dict[str, Any] | tuple:
     """Get accounts for a requisition."""
     try:
-        accounts = gocardless_service.get_accounts(requisition_id)
+        accounts = get_gocardless_service().get_accounts(requisition_id)
         return jsonify(accounts)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -187,7 +205,7 @@ def get_account_details(account_id: str) -> dict[str, Any] | tuple:
     """Get details for an account."""
     try:
         update_cache = request.args.get("update_cache", "false").lower() == "true"
-        details = gocardless_service.get_account_details(account_id, update_cache)
+        details = get_gocardless_service().get_account_details(account_id, update_cache)
         return jsonify(details)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -199,7 +217,7 @@ def get_account_balances(account_id: str) -> dict[str, Any] | tuple:
     """Get balances for an account."""
     try:
         update_cache = request.args.get("update_cache", "false").lower() == "true"
-        balances = gocardless_service.get_account_balances(account_id, update_cache)
+        balances = get_gocardless_service().get_account_balances(account_id, update_cache)
         return jsonify(balances)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -214,7 +232,7 @@ def get_account_transactions(account_id: str) -> dict[str, Any] | tuple:
         date_to = request.args.get("date_to")
         update_cache = request.args.get("update_cache", "false").lower() == "true"
 
-        transactions = gocardless_service.get_account_transactions(
+        transactions = get_gocardless_service().get_account_transactions(
             account_id, date_from, date_to, update_cache
         )
         return jsonify(transactions)
@@ -237,7 +255,7 @@ def link_accounts() -> dict[str, Any] | tuple:
             return jsonify({"error": "account_ids is required"}), 400
 
         user_id = get_jwt_identity()
-        gocardless_service.link_accounts_to_user(requisition_id, account_ids, user_id)
+        get_gocardless_service().link_accounts_to_user(requisition_id, account_ids, user_id)
         return jsonify({"message": "Accounts linked successfully"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -254,7 +272,7 @@ def get_token() -> dict[str, Any] | tuple:
         if not secret_id or not secret_key:
             return jsonify({"error": "secret_id and secret_key are required"}), 400
 
-        token = gocardless_service.get_token(secret_id, secret_key)
+        token = get_gocardless_service().get_token(secret_id, secret_key)
         return jsonify(token)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -266,7 +284,7 @@ def get_user_accounts() -> dict[str, Any] | tuple:
     """Get all GoCardless accounts for the current user."""
     try:
         user_id = get_jwt_identity()
-        accounts = gocardless_service.get_user_accounts(user_id)
+        accounts = get_gocardless_service().get_user_accounts(user_id)
         return jsonify(accounts)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1,4 +1,5 @@
 from functools import wraps
+from threading import Lock
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
@@ -8,10 +9,28 @@ from app.services.stock_service import StockService
 from app.swagger import spec
 
 stock_bp = Blueprint("stock", __name__)
-stock_service = StockService()
 custom_price_service = CustomPriceService()
 
 
+_stock_service: StockService | None = None
+_stock_service_lock = Lock()
+
+
+def get_stock_service() -> StockService:
+    """Create the stock service on first use instead of at import time.
+
+    It starts a cache worker thread and a thread pool, which are only needed
+    once a stock endpoint is actually hit.
+    """
+    global _stock_service  # noqa: PLW0603
+    # Locked so that concurrent first requests cannot each build one
+    if _stock_service is None:
+        with _stock_service_lock:
+            if _stock_service is None:
+                _stock_service = StockService()
+    return _stock_service
+
+
 def jwt_required_wrapper(f):
     @wraps(f)
     @jwt_required()
@@ -29,7 +48,7 @@ def search_stocks():
     if not query or len(query) < 2:
         return jsonify({"error": "Query too short"}), 400
 
-    results = stock_service.search_assets(query)
+    results = get_stock_service().search_assets(query)
     return jsonify(results)
 
 
@@ -37,7 +56,7 @@ def search_stocks():
 @jwt_required_wrapper
 def get_stock_info(symbol: str):
     """Get detailed information about a specific stock."""
-    info = stock_service.get_asset_info(symbol)
+    info = get_stock_service().get_asset_info(symbol)
     if info is None:
         return jsonify({"error": "Stock not found"}), 404
     return jsonify(info)
@@ -48,7 +67,7 @@ def get_stock_info(symbol: str):
 def get_stock_history(symbol: str):
     """Get historical price data for a stock."""
     period = request.args.get("period", "max")
-    history = stock_service.get_historical_prices(symbol, period)
+    history = get_stock_service().get_historical_prices(symbol, period)
     return jsonify(history)
 
 
@@ -469,7 +488,7 @@ register_stock_swagger_docs()
 @jwt_required_wrapper
 def get_stock_details(symbol: str):
     """Get comprehensive details about a stock or ETF."""
-    details = stock_service.get_stock_details(symbol)
+    details = get_stock_service().get_stock_details(symbol)
     if details is None:
         return jsonify({"error": "Failed to fetch stock details"}), 404
     return jsonify(details)
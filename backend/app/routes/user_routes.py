@@ -18,7 +18,7 @@ from app.services.user_service import (
     authenticate_user,
     create_user,
     delete_user,
-    get_user_by_id,
+    get_user_cached,
     update_last_login,
     update_user,
 )
@@ -418,7 +418,7 @@ def refresh() -> tuple[Any, int]:
         user_id = get_jwt_identity()
 
         # Get the user details to include in the new access token
-        user = get_user_by_id(int(user_id))
+        user = get_user_cached(int(user_id))
         if not user:
             return jsonify({"error": "User not found"}), 404
 
@@ -454,7 +454,7 @@ def get_user_admin(user_id: int) -> tuple[Any, int]:
     if error and code:
         return error, code
 
-    user = get_user_by_id(user_id)
+    user = get_user_cached(user_id)
     return (jsonify(user.__dict__), 200) if user else ("", 404)
 
 
@@ -466,7 +466,7 @@ def get_user() -> tuple[Any, int]:
     if error and code:
         return error, code
 
-    user = get_user_by_id(user_id=user_id_from_tokens)
+    user = get_user_cached(int(user_id_from_tokens))
     # Cast to int to fix type error
     update_last_login(user_id=cast(int, user_id_from_tokens), login_time=datetime.now())
     return (jsonify(user.__dict__), 200) if user else ("", 404)
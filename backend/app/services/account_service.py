@@ -1,7 +1,6 @@
 import logging
 from typing import Any
 
-from app.exceptions import NoResultFoundError
 from app.models import Account
 from app.services.base_service import BaseService, ListQueryParams
 
@@ -26,8 +25,11 @@ class AccountService(BaseService):
     ) -> dict[str, Any]:
         result = super().get_all(user_id, query_params)
         # Update balances for items
+        balances = self.calculate_balances(
+            account_ids=[account["id"] for account in result["items"]]
+        )
         for account in result["items"]:
-            account["balance"] = self.calculate_balance(account_id=account["id"])
+            account["balance"] = balances.get(account["id"], 0)
 
             # Add market value for investment accounts
             if account["type"] == "investment":
@@ -40,7 +42,7 @@ class AccountService(BaseService):
         return result
 
     def calculate_balance(self, account_id: int) -> float:
-        """Get account balance from the account_balances view."""
+        """Get account balance from the account_balances table."""
         query = """--sql
         SELECT current_balance
         FROM account_balances
@@ -53,6 +55,25 @@ class AccountService(BaseService):
             print(f"Error getting account balance: {e}")
             return 0
 
+    def calculate_balances(self, account_ids: list[int]) -> dict[int, float]:
+        """Get the balances of several accounts with one account_balances query."""
+        if not account_ids:
+            return {}
+        placeholders = ", ".join("?" * len(account_ids))
+        query = f"""--sql
+        SELECT account_id, current_balance
+        FROM account_balances
+        WHERE account_id IN ({placeholders})
+        """  # noqa: S608
+        try:
+            result = self.db_manager.execute_select(query=query, params=account_ids)
+            return {
+                row["account_id"]: round(row["current_balance"], 2) for row in result
+            }
+        except Exception as e:
+            print(f"Error getting account balances: {e}")
+            return {}
+
     def calculate_market_value(self, account_id: int) -> float:
         """Calculate the market value of all assets in an investment account."""
         try:
@@ -270,9 +291,6 @@ class AccountService(BaseService):
         """
         try:
             result = self.db_manager.execute_select(query=query, params=[user_id])
-        except NoResultFoundError as e:
-            print("error in get_wealth", e)
-            return {}
         except Exception as e:
             print("error in get_wealth", e)
             return {}
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Any, Generic, TypeVar, cast
 
 from app.database import DatabaseManager
-from app.exceptions import NoResultFoundError, QueryExecutionError
+from app.exceptions import QueryExecutionError
 
 
 @dataclass
@@ -64,18 +64,21 @@ class BaseService(Generic[T]):
         successful = []
         failed = []
 
-        for item in items:
-            try:
-                columns = ", ".join(item.keys())
-                placeholders = ", ".join(["?" for _ in item])
-                query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}) RETURNING *"
-                result = self.db_manager.execute_insert_returning(
-                    query, list(item.values())
-                )
-                created_item = self.model_class(**result)
-                successful.append(created_item)
-            except Exception as e:
-                failed.append({"data": item, "error": str(e)})
+        # One commit for the whole batch. A failing insert only undoes itself,
+        # so the other items are still written
+        with self.db_manager.transaction():
+            for item in items:
+                try:
+                    columns = ", ".join(item.keys())
+                    placeholders = ", ".join(["?" for _ in item])
+                    query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders}) RETURNING *"
+                    result = self.db_manager.execute_insert_returning(
+                        query, list(item.values())
+                    )
+                    created_item = self.model_class(**result)
+                    successful.append(created_item)
+                except Exception as e:
+                    failed.append({"data": item, "error": str(e)})
 
         return {
             "successful": successful,
@@ -440,13 +443,6 @@ class BaseService(Generic[T]):
             }
         except ValueError as e:
             raise ValueError(str(e)) from e
-        except NoResultFoundError:
-            return {
-                "items": [],
-                "total": 0,
-                "page": query_params.page,
-                "per_page": query_params.per_page,
-            }
         except Exception as e:
             raise QueryExecutionError(
                 f"Database error: {e!s}", query=query, params=params
@@ -6,7 +6,6 @@ from typing import Literal, TypedDict
 from dateutil.relativedelta import relativedelta
 
 from app.database import DatabaseManager
-from app.exceptions import NoResultFoundError
 
 db_manager = DatabaseManager()
 
@@ -120,11 +119,10 @@ def get_budget_summary(start_date: str, end_date: str, user_id: int):
         category, subcategory
     """
 
-    try:
-        results = db_manager.execute_select(
-            query=query, params=[start_date, end_date, user_id]
-        )
-    except NoResultFoundError:
+    results = db_manager.execute_select(
+        query=query, params=[start_date, end_date, user_id]
+    )
+    if not results:
         return []
     # Organize results by category and subcategory
     category_summary = defaultdict(
@@ -260,11 +258,10 @@ def get_transactions_by_categories(
     ORDER BY t.category, t.subcategory
     """
 
-    try:
-        results = db.execute_select(
-            query=query, params=[user_id, transaction_type, start_date, end_date]
-        )
-    except NoResultFoundError:
+    results = db.execute_select(
+        query=query, params=[user_id, transaction_type, start_date, end_date]
+    )
+    if not results:
         return {}
 
     # Transform the results into the required format
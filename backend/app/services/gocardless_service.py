@@ -312,8 +312,10 @@ class GoCardlessService:
                     balances_data = self.client.account_api(account_id).get_balances()
 
                     # Log details for debugging
-                    logger.debug(f"Account metadata for {account_id}: {account_data}")
-                    logger.debug(f"Balance data for {account_id}: {balances_data}")
+                    logger.debug(
+                        "Account metadata for %s: %s", account_id, account_data
+                    )
+                    logger.debug("Balance data for %s: %s", account_id, balances_data)
 
                     account_info = account_data.get("account", {})
                     balance_info = (
@@ -535,10 +537,17 @@ class GoCardlessService:
                 logger.warning(f"Rate limit response received: {accounts}")
                 raise Exception(f"Rate limit exceeded: {accounts}")
 
-            # Store accounts in database
-            stored_accounts = 0
-            for account in accounts:
-                if account["id"] in account_ids:
+            # Store accounts in database, in a single transaction when possible
+            to_store = [account for account in accounts if account["id"] in account_ids]
+            try:
+                stored_accounts = self._store_accounts(to_store, user_id)
+            except Exception as batch_error:
+                logger.warning(
+                    "Storing accounts in one batch failed, storing them one by one: %s",
+                    batch_error,
+                )
+                stored_accounts = 0
+                for account in to_store:
                     try:
                         self._store_account(account, user_id)
                         stored_accounts += 1
@@ -650,37 +659,51 @@ class GoCardlessService:
             logger.error(f"Error storing agreement: {e}")
             raise
 
+    _STORE_ACCOUNT_QUERY = """--sql
+    INSERT INTO gocardless_accounts (
+        account_id, created_at, last_accessed,
+        iban, institution_id, status,
+        owner_name, currency, balance,
+        account_type, user_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _account_params(account: Account, user_id: int) -> list[Any]:
+        return [
+            account["id"],
+            account["created"],
+            account["last_accessed"],
+            account["iban"],
+            account["institution_id"],
+            account["status"],
+            account["owner_name"],
+            account["currency"],
+            account["balance"],
+            account["account_type"],
+            user_id,
+        ]
+
     def _store_account(self, account: Account, user_id: int) -> None:
         """Store account in database."""
         try:
-            query = """--sql
-            INSERT INTO gocardless_accounts (
-                account_id, created_at, last_accessed,
-                iban, institution_id, status,
-                owner_name, currency, balance,
-                account_type, user_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
             self.db_manager.execute_update(
-                query=query,
-                params=[
-                    account["id"],
-                    account["created"],
-                    account["last_accessed"],
-                    account["iban"],
-                    account["institution_id"],
-                    account["status"],
-                    account["owner_name"],
-                    account["currency"],
-                    account["balance"],
-                    account["account_type"],
-                    user_id,
-                ],
+                query=self._STORE_ACCOUNT_QUERY,
+                params=self._account_params(account, user_id),
             )
         except Exception as e:
             logger.error(f"Error storing account: {e}")
             raise
 
+    def _store_accounts(self, accounts: list[Account], user_id: int) -> int:
+        """Store accounts in database in one transaction; all or none are stored."""
+        if not accounts:
+            return 0
+        return self.db_manager.execute_many(
+            self._STORE_ACCOUNT_QUERY,
+            [self._account_params(account, user_id) for account in accounts],
+        )
+
     def _get_cached_data(self, key: str, cache_type: str) -> Any | None:
         """Get data from cache."""
         try:
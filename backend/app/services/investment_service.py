@@ -9,7 +9,7 @@ import yfinance as yf
 from pandas import DataFrame
 
 from app.database import DatabaseManager
-from app.exceptions import NoResultFoundError, QueryExecutionError
+from app.exceptions import QueryExecutionError
 from app.models import InvestmentTransaction
 from app.schemas.schema_registry import InvestmentTransactionSchema
 from app.services.base_service import BaseService, ListQueryParams
@@ -147,7 +147,7 @@ class InvestmentService(BaseService[InvestmentTransaction]):
                     if isinstance(holdings, dict) and "sectorWeights" in holdings:
                         return holdings["sectorWeights"]
             except Exception as e:
-                logger.debug(f"Could not get holdings for ETF: {e}")
+                logger.debug("Could not get holdings for ETF: %s", e)
 
             # Method 2: Try fund sector weightings
             try:
@@ -158,7 +158,7 @@ class InvestmentService(BaseService[InvestmentTransaction]):
                         for k, v in weightings.items()
                     }
             except Exception as e:
-                logger.debug(f"Could not get fund sector weightings: {e}")
+                logger.debug("Could not get fund sector weightings: %s", e)
 
             return {}
 
@@ -371,13 +371,16 @@ class InvestmentService(BaseService[InvestmentTransaction]):
         successful = []
         failed = []
 
-        for item in items:
-            try:
-                # Create each investment transaction using the existing create method
-                result = self.create(item)
-                successful.append(result)
-            except Exception as e:
-                failed.append({"data": item, "error": str(e)})
+        # Committed once; each create() runs in its own savepoint, so a failed
+        # item leaves none of its rows behind
+        with self.db_manager.transaction():
+            for item in items:
+                try:
+                    # Create each investment transaction using the existing create method
+                    result = self.create(item)
+                    successful.append(result)
+                except Exception as e:
+                    failed.append({"data": item, "error": str(e)})
 
         return {
             "successful": successful,
@@ -392,33 +395,31 @@ class InvestmentService(BaseService[InvestmentTransaction]):
 
         validated_data = self.schema.load(data)
 
-        connection = None
         try:
-            # Start transaction
-            connection = self.db_manager.connect_to_database()
-            connection.execute("BEGIN TRANSACTION")
-
-            # Get asset symbol
-            query = "SELECT symbol FROM assets WHERE id = ?"
-            result = self.db_manager.execute_select(query, [validated_data["asset_id"]])
-            if not result:
-                raise ValueError(
-                    f"Asset with ID {validated_data['asset_id']} not found"
+            # One transaction for the transaction, its P/L entry and details
+            with self.db_manager.transaction():
+                # Get asset symbol
+                query = "SELECT symbol FROM assets WHERE id = ?"
+                result = self.db_manager.execute_select(
+                    query, [validated_data["asset_id"]]
                 )
-            asset_symbol = result[0]["symbol"]
+                if not result:
+                    raise ValueError(
+                        f"Asset with ID {validated_data['asset_id']} not found"
+                    )
+                asset_symbol = result[0]["symbol"]
 
-            # Get the investment account ID (to_account_id for buys, from_account_id for sells)
-            investment_account_id = (
-                validated_data["to_account_id"]
-                if validated_data["activity_type"] == "Buy"
-                else validated_data["from_account_id"]
-            )
+                # Get the investment account ID (to_account_id for buys, from_account_id for sells)
+                investment_account_id = (
+                    validated_data["to_account_id"]
+                    if validated_data["activity_type"] == "Buy"
+                    else validated_data["from_account_id"]
+                )
 
-            # Initialize to avoid reference before assignment
+                # Initialize to avoid reference before assignment
 
-            def get_or_create_pl_account(account_type: str) -> int:
-                """Get or create a P/L account of the specified type."""
-                try:
+                def get_or_create_pl_account(account_type: str) -> int:
+                    """Get or create a P/L account of the specified type."""
                     query = """--sql
                     SELECT id FROM accounts
                     WHERE user_id = ? AND name = 'Investment P/L' AND type = ?
@@ -427,173 +428,178 @@ class InvestmentService(BaseService[InvestmentTransaction]):
                         query, [validated_data["user_id"], account_type]
                     )
 
-                    if result and result[0] and result[0]["id"]:
+                    if result and result[0]["id"]:
                         return result[0]["id"]
-                except NoResultFoundError:
-                    pass  # Account doesn't exist, we'll create it
 
-                # Get bank ID if account doesn't exist
-                bank_query = "SELECT id FROM banks WHERE user_id = ? LIMIT 1"
-                bank_result = self.db_manager.execute_select(
-                    bank_query, [validated_data["user_id"]]
-                )
-
-                if not bank_result:
-                    raise ValueError(
-                        "No bank found for user. Please create a bank first."
+                    # Get bank ID if account doesn't exist
+                    bank_query = "SELECT id FROM banks WHERE user_id = ? LIMIT 1"
+                    bank_result = self.db_manager.execute_select(
+                        bank_query, [validated_data["user_id"]]
                     )
 
-                bank_id = bank_result[0]["id"]
-
-                # Create new account
-                create_query = """--sql
-                INSERT INTO accounts (user_id, name, type, bank_id)
-                VALUES (?, 'Investment P/L', ?, ?)
-                RETURNING id
-                """
-                insert_result = self.db_manager.execute_insert_returning(
-                    create_query,
-                    [validated_data["user_id"], account_type, bank_id],
-                )
-                return insert_result["id"]
-
-            # Get or create both P/L accounts
-            pl_account_expense_id = get_or_create_pl_account("expense")
-            pl_account_income_id = get_or_create_pl_account("income")
-
-            if validated_data["activity_type"] == "Buy":
-                description = f"Buy {validated_data['quantity']} {asset_symbol} at {validated_data['unit_price']}€"
-                amount = (
-                    validated_data["quantity"] * validated_data["unit_price"]
-                    + validated_data["fee"]
-                    + validated_data["tax"]
-                )
-            elif validated_data["activity_type"] == "Sell":
-                # Calculate the original cost basis for this sale
-                cost_basis_query = """--sql
-                SELECT SUM(i.quantity * i.unit_price + i.fee + i.tax) as total_cost,
-                       SUM(i.quantity) as total_quantity
-                FROM investment_details i
-                JOIN transactions t ON i.transaction_id = t.id
-                WHERE i.asset_id = ? AND t.user_id = ? AND i.investment_type = 'Buy'
-                """
-                cost_basis_result = self.db_manager.execute_select(
-                    cost_basis_query,
-                    [validated_data["asset_id"], validated_data["user_id"]],
-                )
-
-                if not cost_basis_result or cost_basis_result[0]["total_quantity"] == 0:
-                    raise ValueError("No cost basis found for this asset")
-
-                total_cost = float(cost_basis_result[0]["total_cost"])
-                total_quantity = float(cost_basis_result[0]["total_quantity"])
+                    if not bank_result:
+                        raise ValueError(
+                            "No bank found for user. Please create a bank first."
+                        )
 
-                # Calculate the portion of cost basis for this sale
-                sale_ratio = validated_data["quantity"] / total_quantity
-                cost_basis_for_sale = total_cost * sale_ratio
+                    bank_id = bank_result[0]["id"]
 
-                # Calculate sale proceeds
-                sale_proceeds = (
-                    validated_data["quantity"] * validated_data["unit_price"]
-                    - validated_data["fee"]
-                    - validated_data["tax"]
-                )
+                    # Create new account
+                    create_query = """--sql
+                    INSERT INTO accounts (user_id, name, type, bank_id)
+                    VALUES (?, 'Investment P/L', ?, ?)
+                    RETURNING id
+                    """
+                    insert_result = self.db_manager.execute_insert_returning(
+                        create_query,
+                        [validated_data["user_id"], account_type, bank_id],
+                    )
+                    return insert_result["id"]
+
+                # Get or create both P/L accounts
+                pl_account_expense_id = get_or_create_pl_account("expense")
+                pl_account_income_id = get_or_create_pl_account("income")
+
+                if validated_data["activity_type"] == "Buy":
+                    description = f"Buy {validated_data['quantity']} {asset_symbol} at {validated_data['unit_price']}€"
+                    amount = (
+                        validated_data["quantity"] * validated_data["unit_price"]
+                        + validated_data["fee"]
+                        + validated_data["tax"]
+                    )
+                elif validated_data["activity_type"] == "Sell":
+                    # Calculate the original cost basis for this sale
+                    cost_basis_query = """--sql
+                    SELECT SUM(i.quantity * i.unit_price + i.fee + i.tax) as total_cost,
+                           SUM(i.quantity) as total_quantity
+                    FROM investment_details i
+                    JOIN transactions t ON i.transaction_id = t.id
+                    WHERE i.asset_id = ? AND t.user_id = ? AND i.investment_type = 'Buy'
+                    """
+                    cost_basis_result = self.db_manager.execute_select(
+                        cost_basis_query,
+                        [validated_data["asset_id"], validated_data["user_id"]],
+                    )
 
-                # Calculate profit/loss
-                profit_loss = sale_proceeds - cost_basis_for_sale
+                    if (
+                        not cost_basis_result
+                        or cost_basis_result[0]["total_quantity"] == 0
+                    ):
+                        raise ValueError("No cost basis found for this asset")
 
-                description = f"Sell {validated_data['quantity']} {asset_symbol} at {validated_data['unit_price']}€"
-                amount = sale_proceeds  # This is the main transaction amount
+                    total_cost = float(cost_basis_result[0]["total_cost"])
+                    total_quantity = float(cost_basis_result[0]["total_quantity"])
 
-                # Create profit/loss transaction if there is a gain or loss
-                if (
-                    abs(profit_loss) > 0.01
-                ):  # Use small threshold to avoid floating point issues
-                    if profit_loss > 0:
-                        pl_description = f"Investment P/L for {asset_symbol} sale: gain"
-                        from_account_id = pl_account_income_id
-                        to_account_id = investment_account_id
-                        type = "income"
-                    else:
-                        pl_description = f"Investment P/L for {asset_symbol} sale: loss"
-                        from_account_id = investment_account_id
-                        to_account_id = pl_account_expense_id
-                        type = "expense"
-                    pl_transaction_data = {
-                        "user_id": validated_data["user_id"],
-                        "date": validated_data["date"],
-                        "date_accountability": validated_data["date"],
-                        "description": pl_description,
-                        "amount": abs(profit_loss),
-                        "from_account_id": from_account_id,
-                        "to_account_id": to_account_id,
-                        "category": "Investissements",
-                        "type": type,
-                    }
+                    # Calculate the portion of cost basis for this sale
+                    sale_ratio = validated_data["quantity"] / total_quantity
+                    cost_basis_for_sale = total_cost * sale_ratio
 
-                    # Insert P/L transaction
-                    pl_columns = ", ".join(pl_transaction_data.keys())
-                    pl_placeholders = ", ".join(["?" for _ in pl_transaction_data])
-                    pl_query = f"INSERT INTO transactions ({pl_columns}) VALUES ({pl_placeholders}) RETURNING *"
-                    pl_transaction_result = self.db_manager.execute_insert_returning(
-                        pl_query, params=list(pl_transaction_data.values())
+                    # Calculate sale proceeds
+                    sale_proceeds = (
+                        validated_data["quantity"] * validated_data["unit_price"]
+                        - validated_data["fee"]
+                        - validated_data["tax"]
                     )
-            elif validated_data["activity_type"] == "Dividend":
-                description = (
-                    f"Dividend {asset_symbol} -> {validated_data['unit_price']}€"
-                )
-                amount = validated_data["unit_price"]
-            else:
-                description = f"{validated_data['activity_type'].title()} {validated_data['quantity']} {asset_symbol} at {validated_data['unit_price']}€"
-                amount = validated_data["quantity"] * validated_data["unit_price"]
 
-            # Prepare transaction data
-            transaction_data = {
-                "user_id": validated_data["user_id"],
-                "date": validated_data["date"],
-                "date_accountability": validated_data["date"],
-                "description": description,
-                "amount": amount,
-                "from_account_id": validated_data["from_account_id"],
-                "to_account_id": validated_data["to_account_id"],
-                "category": "Investissements",
-                "type": "transfer",
-                "is_investment": True,
-            }
+                    # Calculate profit/loss
+                    profit_loss = sale_proceeds - cost_basis_for_sale
+
+                    description = f"Sell {validated_data['quantity']} {asset_symbol} at {validated_data['unit_price']}€"
+                    amount = sale_proceeds  # This is the main transaction amount
+
+                    # Create profit/loss transaction if there is a gain or loss
+                    if (
+                        abs(profit_loss) > 0.01
+                    ):  # Use small threshold to avoid floating point issues
+                        if profit_loss > 0:
+                            pl_description = (
+                                f"Investment P/L for {asset_symbol} sale: gain"
+                            )
+                            from_account_id = pl_account_income_id
+                            to_account_id = investment_account_id
+                            type = "income"
+                        else:
+                            pl_description = (
+                                f"Investment P/L for {asset_symbol} sale: loss"
+                            )
+                            from_account_id = investment_account_id
+                            to_account_id = pl_account_expense_id
+                            type = "expense"
+                        pl_transaction_data = {
+                            "user_id": validated_data["user_id"],
+                            "date": validated_data["date"],
+                            "date_accountability": validated_data["date"],
+                            "description": pl_description,
+                            "amount": abs(profit_loss),
+                            "from_account_id": from_account_id,
+                            "to_account_id": to_account_id,
+                            "category": "Investissements",
+                            "type": type,
+                        }
 
-            # Create transaction
-            columns = ", ".join(transaction_data.keys())
-            placeholders = ", ".join(["?" for _ in transaction_data])
-            query = f"INSERT INTO transactions ({columns}) VALUES ({placeholders}) RETURNING *"
-            transaction_result = self.db_manager.execute_insert_returning(
-                query=query, params=list(transaction_data.values())
-            )
+                        # Insert P/L transaction
+                        pl_columns = ", ".join(pl_transaction_data.keys())
+                        pl_placeholders = ", ".join(["?" for _ in pl_transaction_data])
+                        pl_query = f"INSERT INTO transactions ({pl_columns}) VALUES ({pl_placeholders}) RETURNING *"
+                        pl_transaction_result = (
+                            self.db_manager.execute_insert_returning(
+                                pl_query, params=list(pl_transaction_data.values())
+                            )
+                        )
+                elif validated_data["activity_type"] == "Dividend":
+                    description = (
+                        f"Dividend {asset_symbol} -> {validated_data['unit_price']}€"
+                    )
+                    amount = validated_data["unit_price"]
+                else:
+                    description = f"{validated_data['activity_type'].title()} {validated_data['quantity']} {asset_symbol} at {validated_data['unit_price']}€"
+                    amount = validated_data["quantity"] * validated_data["unit_price"]
+
+                # Prepare transaction data
+                transaction_data = {
+                    "user_id": validated_data["user_id"],
+                    "date": validated_data["date"],
+                    "date_accountability": validated_data["date"],
+                    "description": description,
+                    "amount": amount,
+                    "from_account_id": validated_data["from_account_id"],
+                    "to_account_id": validated_data["to_account_id"],
+                    "category": "Investissements",
+                    "type": "transfer",
+                    "is_investment": True,
+                }
 
-            # Prepare investment details data
-            investment_data = {
-                "transaction_id": transaction_result["id"],
-                "asset_id": validated_data["asset_id"],
-                "quantity": validated_data["quantity"],
-                "investment_type": validated_data["activity_type"].title(),
-                "unit_price": validated_data["unit_price"],
-                "fee": validated_data["fee"],
-                "tax": validated_data["tax"],
-                "total_paid": (
-                    validated_data["quantity"] * validated_data["unit_price"]
+                # Create transaction
+                columns = ", ".join(transaction_data.keys())
+                placeholders = ", ".join(["?" for _ in transaction_data])
+                query = f"INSERT INTO transactions ({columns}) VALUES ({placeholders}) RETURNING *"
+                transaction_result = self.db_manager.execute_insert_returning(
+                    query=query, params=list(transaction_data.values())
                 )
-                + validated_data["fee"]
-                + validated_data["tax"],
-            }
 
-            # Create investment details
-            columns = ", ".join(investment_data.keys())
-            placeholders = ", ".join(["?" for _ in investment_data])
-            query = f"INSERT INTO investment_details ({columns}) VALUES ({placeholders}) RETURNING *"
-            investment_result = self.db_manager.execute_insert_returning(
-                query=query, params=list(investment_data.values())
-            )
+                # Prepare investment details data
+                investment_data = {
+                    "transaction_id": transaction_result["id"],
+                    "asset_id": validated_data["asset_id"],
+                    "quantity": validated_data["quantity"],
+                    "investment_type": validated_data["activity_type"].title(),
+                    "unit_price": validated_data["unit_price"],
+                    "fee": validated_data["fee"],
+                    "tax": validated_data["tax"],
+                    "total_paid": (
+                        validated_data["quantity"] * validated_data["unit_price"]
+                    )
+                    + validated_data["fee"]
+                    + validated_data["tax"],
+                }
 
-            connection.commit()
+                # Create investment details
+                columns = ", ".join(investment_data.keys())
+                placeholders = ", ".join(["?" for _ in investment_data])
+                query = f"INSERT INTO investment_details ({columns}) VALUES ({placeholders}) RETURNING *"
+                investment_result = self.db_manager.execute_insert_returning(
+                    query=query, params=list(investment_data.values())
+                )
 
             # Return the complete response with all IDs
             return {
@@ -614,8 +620,6 @@ class InvestmentService(BaseService[InvestmentTransaction]):
             }
 
         except Exception as e:
-            if connection is not None:
-                connection.rollback()
             logger.error(f"Error creating investment transaction: {e}")
             raise
 
@@ -663,11 +667,10 @@ class InvestmentService(BaseService[InvestmentTransaction]):
         WHERE t.user_id = ?
         ORDER BY t.date ASC
         """
-        try:
-            investment_transactions = self.db_manager.execute_select(
-                investment_query, [user_id]
-            )
-        except NoResultFoundError:
+        investment_transactions = self.db_manager.execute_select(
+            investment_query, [user_id]
+        )
+        if not investment_transactions:
             return "No investment transactions found, please add some investment transactions to show your portfolio summary"
 
         # Calculate initial and net investment
@@ -909,16 +912,12 @@ class InvestmentService(BaseService[InvestmentTransaction]):
         ORDER BY t.date ASC -- Crucial: ensure transactions are sorted by date
         """
 
-        try:
-            transactions = self.db_manager.execute_select(
-                query=query,
-                params=[user_id],
-            )
-        except NoResultFoundError:
-            return {"data_points": [], "summary": {}}  # Return empty if no transactions
-
+        transactions = self.db_manager.execute_select(
+            query=query,
+            params=[user_id],
+        )
         if not transactions:
-            return {"data_points": [], "summary": {}}
+            return {"data_points": [], "summary": {}}  # Return empty if no transactions
 
         # Determine date range
         start_date = datetime.strptime(
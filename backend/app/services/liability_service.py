@@ -2,7 +2,7 @@ import dataclasses
 from datetime import date, datetime, timedelta
 from typing import Any, cast
 
-from app.exceptions import NoResultFoundError, QueryExecutionError
+from app.exceptions import QueryExecutionError
 from app.logger import get_logger
 from app.models import Liability, LiabilityPaymentDetail
 from app.services.base_service import BaseService, ListQueryParams
@@ -761,18 +761,16 @@ class LiabilityService(BaseService[Liability]):
         from app.services.transaction_service import TransactionService
         from app.services.base_service import ListQueryParams
 
-        pl_account_expense_id = None
-        try:
-            pl_account_query = """--sql
-            SELECT id FROM accounts
-            WHERE user_id = ? AND name = 'Investment P/L' AND type = 'expense'
-            """
-            pl_account_expense_result = self.db_manager.execute_select(
-                pl_account_query, [user_id]
-            )
+        pl_account_query = """--sql
+        SELECT id FROM accounts
+        WHERE user_id = ? AND name = 'Investment P/L' AND type = 'expense'
+        """
+        pl_account_expense_result = self.db_manager.execute_select(
+            pl_account_query, [user_id]
+        )
+        if pl_account_expense_result:
             pl_account_expense_id = pl_account_expense_result[0]["id"]
-
-        except NoResultFoundError:
+        else:
             bank_query = "SELECT id FROM banks WHERE user_id = ? LIMIT 1"
             bank_result = self.db_manager.execute_select(
                 bank_query, [user_id]
@@ -904,10 +902,7 @@ class LiabilityPaymentDetailService(BaseService[LiabilityPaymentDetail]):
             WHERE liability_id = ? AND user_id = ?
             ORDER BY payment_date ASC, transaction_id ASC
         """
-        try:
-            return self.db_manager.execute_select(query, [liability_id, user_id])
-        except NoResultFoundError:
-            return []
+        return self.db_manager.execute_select(query, [liability_id, user_id])
 
     def record_payment(
         self,
@@ -957,7 +952,7 @@ class LiabilityPaymentDetailService(BaseService[LiabilityPaymentDetail]):
                 )
                 if transaction_result:
                     payment_dict["transaction"] = transaction_result[0]
-            except (NoResultFoundError, QueryExecutionError):
+            except QueryExecutionError:
                 self.logger.info(
                     f"Transaction details not found for id: {transaction_id}"
                 )
@@ -252,7 +252,7 @@ class TransactionService(BaseService[Transaction]):
     ) -> tuple[str, list[Any]]:
         # Create a copy of filters to avoid modifying the original
         filters_copy = filters.copy()
-        self.logger.debug(f"Building filter conditions with filters: {filters_copy}")
+        self.logger.debug("Building filter conditions with filters: %s", filters_copy)
 
         # Handle date range filters
         if "from_date" in filters_copy:
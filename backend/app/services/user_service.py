@@ -1,4 +1,8 @@
+from dataclasses import replace
 from datetime import UTC, datetime
+from threading import Lock
+
+from cachetools import TTLCache
 
 from app.database import DatabaseManager
 from app.exceptions import DuplicateUserError, NoResultFoundError, QueryExecutionError
@@ -7,6 +11,13 @@ from app.services.base_service import BaseService
 
 db_manager = DatabaseManager()
 
+# Users looked up from a JWT identity. Entries live at most 60 seconds,
+# updates and deletions evict them, and logins refresh their last_login.
+# The cache is per process: with several gunicorn workers, the others may
+# serve the old profile until their entry expires.
+_user_cache: TTLCache[int, User] = TTLCache(maxsize=5000, ttl=60)
+_user_cache_lock = Lock()
+
 
 class UserService(BaseService):
     def __init__(self):
@@ -39,18 +50,10 @@ def create_user(name: str, email: str, password: str) -> User | None:
 
 def get_user_by_id(user_id: int) -> User | None:
     try:
-        result = db_manager.execute_select(
+        user_data = db_manager.execute_select_one(
             query="SELECT * FROM users WHERE id = ?",
             params=[user_id],
         )
-        if not result:
-            raise NoResultFoundError(
-                message="No user found with the given ID.",
-                query="SELECT * FROM users WHERE id = ?",
-                params=[user_id],
-            )
-
-        user_data = result[0]
         return User(
             id=user_data["id"],
             name=user_data["name"],
@@ -69,6 +72,31 @@ def get_user_by_id(user_id: int) -> User | None:
         return None
 
 
+def get_user_cached(user_id: int) -> User | None:
+    """Return the user with the given ID, from a short-lived per-process cache."""
+    with _user_cache_lock:
+        user = _user_cache.get(user_id)
+    if user is None:
+        user = get_user_by_id(user_id)
+        if user is not None:
+            with _user_cache_lock:
+                _user_cache[user_id] = user
+    return user
+
+
+def _evict_cached_user(user_id: int) -> None:
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+def _refresh_cached_last_login(user_id: int, login_time: datetime) -> None:
+    with _user_cache_lock:
+        user = _user_cache.get(user_id)
+        if user is not None:
+            # Formatted like sqlite3 stores datetimes, as a SELECT would return it
+            _user_cache[user_id] = replace(user, last_login=login_time.isoformat(" "))
+
+
 def update_user(
     user_id: int,
     name: str | None = None,
@@ -95,6 +123,7 @@ def update_user(
         query = f"UPDATE users SET {', '.join(update_fields)} WHERE id = ? RETURNING *"
         params.extend([user_id])
         user = db_manager.execute_update_returning(query=query, params=params)
+        _evict_cached_user(user_id)
         return User(
             id=user["id"],
             name=user["name"],
@@ -110,6 +139,7 @@ def update_user(
 def delete_user(user_id: int) -> bool:
     try:
         db_manager.execute_delete("DELETE FROM users WHERE id = ?", [user_id])
+        _evict_cached_user(user_id)
         return True
     except Exception as e:
         print(f"Error deleting user: {e}")
@@ -118,18 +148,10 @@ def delete_user(user_id: int) -> bool:
 
 def authenticate_user(email: str, password: str) -> User | None:
     try:
-        result = db_manager.execute_select(
+        user_data = db_manager.execute_select_one(
             query="SELECT * FROM users WHERE email = ? AND password = ?",
             params=[email, password],
         )
-        if not result:
-            raise NoResultFoundError(
-                message="No user found with the given email and password.",
-                query="SELECT * FROM users WHERE email = ? AND password = ?",
-                params=[email, password],
-            )
-
-        user_data = result[0]
         return User(
             id=user_data["id"],
             name=user_data["name"],
@@ -154,6 +176,7 @@ def update_last_login(user_id: int, login_time: datetime) -> bool:
             query="UPDATE users SET last_login = ? WHERE id = ?",
             params=[login_time, user_id],
         )
+        _refresh_cached_last_login(user_id, login_time)
         if user:
             return True
         return False
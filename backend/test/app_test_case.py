@@ -0,0 +1,79 @@
+# ruff: noqa: S101
+"""Shared harness for the in-process tests.
+
+test_api.py exercises a deployed server over HTTP, so it cannot check what
+happens inside the database or the per-process caches. The other test modules
+run the app through Flask's test client instead, against the temporary
+database set up in conftest.py.
+"""
+
+import unittest
+from itertools import count
+from typing import Any
+
+from app import create_app
+from app.database import DatabaseManager
+
+app = create_app()
+db_manager = DatabaseManager()
+_emails = count()
+
+
+class AppTestCase(unittest.TestCase):
+    """Base test class that registers and logs in a fresh user."""
+
+    def setUp(self) -> None:
+        self.client = app.test_client()
+        email = f"user{next(_emails)}@example.com"
+        response = self.client.post(
+            "/users/register",
+            json={"name": "Test", "email": email, "password": "password123"},
+        )
+        assert response.status_code == 201, response.get_json()
+        self.user_id: int = response.get_json()["id"]
+        self.email = email
+        self.headers = self.login()
+
+    def login(self) -> dict[str, str]:
+        response = self.client.post(
+            "/users/login", json={"email": self.email, "password": "password123"}
+        )
+        assert response.status_code == 200, response.get_json()
+        return {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+
+    def create_bank(self) -> int:
+        response = self.client.post(
+            "/banks/", json={"name": "Test bank"}, headers=self.headers
+        )
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()["id"]
+
+    def create_account(self, bank_id: int, name: str, account_type: str) -> int:
+        response = self.client.post(
+            "/accounts/",
+            json={"name": name, "type": account_type, "bank_id": bank_id},
+            headers=self.headers,
+        )
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()["id"]
+
+    def transaction_data(
+        self, from_id: int, to_id: int, amount: float
+    ) -> dict[str, Any]:
+        return {
+            "date": "2024-01-01",
+            "date_accountability": "2024-01-01",
+            "description": "Test transaction",
+            "amount": amount,
+            "from_account_id": from_id,
+            "to_account_id": to_id,
+            "category": "Virements internes",
+            "type": "transfer",
+        }
+
+    def balance(self, account_id: int) -> float:
+        row = db_manager.execute_select_one(
+            "SELECT current_balance FROM account_balances WHERE account_id = ?",
+            [account_id],
+        )
+        return row["current_balance"]
@@ -0,0 +1,16 @@
+"""Point the in-process tests at a throwaway SQLite database.
+
+This runs before any test module is imported, which matters because the app
+services open their DatabaseManager, and read SQLITE_DB_PATH, at import.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+_db_dir = tempfile.TemporaryDirectory()
+os.environ["SQLITE_DB_PATH"] = str(Path(_db_dir.name) / "test.db")
+
+
+def pytest_unconfigure() -> None:
+    _db_dir.cleanup()
@@ -0,0 +1,72 @@
+# ruff: noqa: S101, PLR2004
+
+from app_test_case import AppTestCase
+
+
+class TestAccountBalances(AppTestCase):
+    """account_balances is maintained by triggers on transactions."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        bank_id = self.create_bank()
+        self.checking = self.create_account(bank_id, "Checking", "checking")
+        self.savings = self.create_account(bank_id, "Savings", "savings")
+        self.other = self.create_account(bank_id, "Other savings", "savings")
+
+    def create_transaction(self, from_id: int, to_id: int, amount: float) -> int:
+        response = self.client.post(
+            "/transactions/",
+            json=self.transaction_data(from_id, to_id, amount),
+            headers=self.headers,
+        )
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()["id"]
+
+    def test_new_account_starts_at_zero(self):
+        assert self.balance(self.checking) == 0
+
+    def test_insert_moves_amount(self):
+        self.create_transaction(self.checking, self.savings, 100)
+        assert self.balance(self.checking) == -100
+        assert self.balance(self.savings) == 100
+
+    def test_update_amount_and_accounts(self):
+        transaction_id = self.create_transaction(self.checking, self.savings, 100)
+        response = self.client.put(
+            f"/transactions/{transaction_id}",
+            json={"amount": 40, "to_account_id": self.other},
+            headers=self.headers,
+        )
+        assert response.status_code == 200, response.get_json()
+        assert self.balance(self.checking) == -40
+        assert self.balance(self.savings) == 0
+        assert self.balance(self.other) == 40
+
+    def test_delete_restores_balances(self):
+        transaction_id = self.create_transaction(self.checking, self.savings, 100)
+        response = self.client.delete(
+            f"/transactions/{transaction_id}", headers=self.headers
+        )
+        assert response.status_code == 204
+        assert self.balance(self.checking) == 0
+        assert self.balance(self.savings) == 0
+
+    def test_no_rounding_drift(self):
+        transaction_ids = [
+            self.create_transaction(self.checking, self.savings, 0.1) for _ in range(10)
+        ]
+        for transaction_id in transaction_ids:
+            response = self.client.delete(
+                f"/transactions/{transaction_id}", headers=self.headers
+            )
+            assert response.status_code == 204
+        assert self.balance(self.checking) == 0
+        assert self.balance(self.savings) == 0
+
+    def test_balances_match_account_list(self):
+        self.create_transaction(self.checking, self.savings, 25.5)
+        response = self.client.get("/accounts/", headers=self.headers)
+        assert response.status_code == 200
+        balances = {a["id"]: a["balance"] for a in response.get_json()["items"]}
+        assert balances[self.checking] == -25.5
+        assert balances[self.savings] == 25.5
@@ -0,0 +1,43 @@
+# ruff: noqa: S101, PLR2004
+
+import time
+from datetime import timedelta
+
+from app_test_case import AppTestCase, app
+from flask_jwt_extended import create_access_token
+
+
+class TestJWTCache(AppTestCase):
+    def token(self, expires_delta: timedelta) -> dict[str, str]:
+        with app.app_context():
+            token = create_access_token(
+                identity=str(self.user_id), expires_delta=expires_delta
+            )
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_cached_token_rejected_after_expiry(self):
+        headers = self.token(timedelta(seconds=1))
+        response = self.client.get("/users/", headers=headers)
+        assert response.status_code == 200
+        # Still within JWT_CACHE_TTL, so only the token's exp can evict it
+        time.sleep(2.1)
+        response = self.client.get("/users/", headers=headers)
+        assert response.status_code == 401
+        assert response.get_json()["error"] == "token_expired"
+
+    def test_invalid_token_not_cached(self):
+        headers = {"Authorization": "Bearer not-a-token"}
+        for _ in range(2):
+            response = self.client.get("/users/", headers=headers)
+            assert response.status_code == 401
+
+    def test_cached_claims_are_copies(self):
+        headers = self.token(timedelta(minutes=5))
+        token = headers["Authorization"].removeprefix("Bearer ")
+        jwt_manager = app.extensions["flask-jwt-extended"]
+        with app.app_context():
+            claims = jwt_manager._decode_jwt_from_config(token)
+            claims["sub"] = "tampered"
+            assert jwt_manager._decode_jwt_from_config(token)["sub"] == str(
+                self.user_id
+            )
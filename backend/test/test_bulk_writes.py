@@ -0,0 +1,96 @@
+# ruff: noqa: S101, PLR2004
+
+from app.exceptions import QueryExecutionError
+from app.models import Bank, Transaction
+from app.services.base_service import BaseService
+from app_test_case import AppTestCase, db_manager
+
+
+class BankBatchTestCase(AppTestCase):
+    def count_banks(self) -> int:
+        row = db_manager.execute_select_one(
+            "SELECT COUNT(*) AS n FROM banks WHERE user_id = ?", [self.user_id]
+        )
+        return row["n"]
+
+
+class TestExecuteMany(BankBatchTestCase):
+    def test_inserts_every_row(self):
+        rows = [(self.user_id, "First"), (self.user_id, "Second")]
+        inserted = db_manager.execute_many(
+            "INSERT INTO banks (user_id, name) VALUES (?, ?)", rows
+        )
+        assert inserted == 2
+        assert self.count_banks() == 2
+
+    def test_execute_many_rolls_back_every_row(self):
+        rows = [(self.user_id, "First"), (self.user_id, None), (self.user_id, "Third")]
+        with self.assertRaises(QueryExecutionError):
+            db_manager.execute_many(
+                "INSERT INTO banks (user_id, name) VALUES (?, ?)", rows
+            )
+        assert self.count_banks() == 0
+
+
+class TestBatchCreate(BankBatchTestCase):
+    def test_batch_create_only_drops_failing_row(self):
+        service = BaseService("banks", Bank)
+        result = service.batch_create(
+            [
+                {"user_id": self.user_id, "name": "First"},
+                {"user_id": self.user_id, "name": None},
+                {"user_id": self.user_id, "name": "Third"},
+            ]
+        )
+        assert result["total_successful"] == 2
+        assert result["total_failed"] == 1
+        assert self.count_banks() == 2
+
+    def test_batch_create_transactions_keeps_balances_consistent(self):
+        bank_id = self.create_bank()
+        checking = self.create_account(bank_id, "Checking", "checking")
+        savings = self.create_account(bank_id, "Savings", "savings")
+        response = self.client.post(
+            "/transactions/batch/create",
+            json={
+                "items": [
+                    self.transaction_data(checking, savings, 10),
+                    self.transaction_data(checking, 999999, 20),
+                    self.transaction_data(checking, savings, 30),
+                ]
+            },
+            headers=self.headers,
+        )
+        assert response.status_code == 200, response.get_json()
+        assert response.get_json()["total_failed"] == 1
+        assert self.balance(checking) == -40
+        assert self.balance(savings) == 40
+
+    def test_rejected_transaction_leaves_no_balance_change(self):
+        bank_id = self.create_bank()
+        checking = self.create_account(bank_id, "Checking", "checking")
+        savings = self.create_account(bank_id, "Savings", "savings")
+        # The expense trigger aborts this row inside the batch transaction
+        rejected = {
+            **self.transaction_data(checking, savings, 20),
+            "type": "expense",
+        }
+        service = BaseService("transactions", Transaction)
+        result = service.batch_create(
+            [
+                {
+                    **self.transaction_data(checking, savings, 10),
+                    "user_id": self.user_id,
+                },
+                {**rejected, "user_id": self.user_id},
+                {
+                    **self.transaction_data(checking, savings, 30),
+                    "user_id": self.user_id,
+                },
+            ]
+        )
+        assert result["total_successful"] == 2
+        assert result["total_failed"] == 1
+        assert "Expenses must go to an expense account" in result["failed"][0]["error"]
+        assert self.balance(checking) == -40
+        assert self.balance(savings) == 40
@@ -0,0 +1,74 @@
+# ruff: noqa: S101, PLR2004
+
+import unittest
+
+from app_test_case import app
+
+
+class TestLocalizedCategories(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = app.test_client()
+
+    def test_default_is_bilingual(self):
+        response = self.client.get("/budgets/categories/expense")
+        assert response.status_code == 200
+        assert set(response.get_json()[0]["name"]) == {"fr", "en"}
+
+    def test_lang_projection(self):
+        response = self.client.get("/budgets/categories/expense?lang=en")
+        assert response.status_code == 200
+        categories = response.get_json()
+        assert all(isinstance(c["name"], str) for c in categories)
+        assert all(
+            isinstance(sub["name"], str)
+            for c in categories
+            for sub in c["subCategories"]
+        )
+
+    def test_lang_projection_of_all_types(self):
+        response = self.client.get("/budgets/categories?lang=fr")
+        assert response.status_code == 200
+        assert set(response.get_json()) == {"expense", "income", "transfer"}
+
+    def test_invalid_lang(self):
+        for url in ("/budgets/categories?lang=zz", "/budgets/categories/expense?lang="):
+            response = self.client.get(url)
+            assert response.status_code == 400, url
+            assert "Invalid language" in response.get_json()["error"]
+
+
+class TestCategoriesETag(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = app.test_client()
+
+    def test_etag_not_modified(self):
+        response = self.client.get("/budgets/categories")
+        etag = response.headers["ETag"]
+        assert response.status_code == 200
+        response = self.client.get(
+            "/budgets/categories", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.get_data() == b""
+
+    def test_etag_differs_per_blob(self):
+        etags = {
+            self.client.get(url).headers["ETag"]
+            for url in (
+                "/budgets/categories",
+                "/budgets/categories?lang=fr",
+                "/budgets/categories/expense",
+            )
+        }
+        assert len(etags) == 3
+
+    def test_gzipped_response_has_weak_etag(self):
+        headers = {"Accept-Encoding": "gzip"}
+        response = self.client.get("/budgets/categories", headers=headers)
+        assert response.headers.get("Content-Encoding") == "gzip"
+        etag = response.headers["ETag"]
+        assert etag.startswith("W/")
+        response = self.client.get(
+            "/budgets/categories", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
@@ -0,0 +1,35 @@
+# ruff: noqa: S101, PLR2004
+
+import unittest
+
+from app_test_case import app
+
+
+class TestCORS(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = app.test_client()
+
+    def test_preflight_allows_requested_headers(self):
+        response = self.client.options(
+            "/accounts/",
+            headers={
+                "Origin": "http://localhost:5173",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": "authorization, x-client-version",
+            },
+        )
+        assert response.status_code == 204
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+        assert "POST" in response.headers["Access-Control-Allow-Methods"]
+        assert (
+            response.headers["Access-Control-Allow-Headers"]
+            == "authorization, x-client-version"
+        )
+
+    def test_simple_request_allows_any_origin(self):
+        response = self.client.get("/health")
+        assert response.status_code == 200
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+
+    def test_unknown_path_is_not_found(self):
+        assert self.client.get("/nonexistent").status_code == 404
@@ -0,0 +1,28 @@
+# ruff: noqa: S101, PLR2004
+
+import unittest
+
+from app_test_case import app
+
+
+class TestJWTErrors(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client = app.test_client()
+
+    def test_invalid_token_reason(self):
+        response = self.client.get(
+            "/users/", headers={"Authorization": "Bearer not-a-token"}
+        )
+        assert response.status_code == 401
+        assert response.get_json() == {
+            "msg": "Invalid token",
+            "error": "Not enough segments",
+        }
+
+    def test_missing_header_reason(self):
+        response = self.client.get("/users/")
+        assert response.status_code == 401
+        assert response.get_json() == {
+            "msg": "Missing Authorization Header",
+            "error": "Missing Authorization Header",
+        }
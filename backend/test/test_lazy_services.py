@@ -0,0 +1,45 @@
+# ruff: noqa: S101, PLR2004
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.routes import gocardless_routes, stock_routes
+
+
+class TestLazyServices(unittest.TestCase):
+    def assert_built_once(self, module: object, name: str, cls: str) -> None:
+        built: list[object] = []
+
+        def build() -> object:
+            # Slow enough for every thread to miss the first check
+            time.sleep(0.05)
+            service = object()
+            built.append(service)
+            return service
+
+        getter = getattr(module, f"get_{name}")
+        with (
+            mock.patch.object(module, f"_{name}", None),
+            mock.patch.object(module, cls, side_effect=build),
+        ):
+            results: list[object] = []
+            threads = [
+                threading.Thread(target=lambda: results.append(getter()))
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert len(built) == 1
+        assert results == built * 8
+
+    def test_stock_service_built_once(self):
+        self.assert_built_once(stock_routes, "stock_service", "StockService")
+
+    def test_gocardless_service_built_once(self):
+        self.assert_built_once(
+            gocardless_routes, "gocardless_service", "GoCardlessService"
+        )
@@ -0,0 +1,57 @@
+# ruff: noqa: S101, PLR2004
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+from pathlib import Path
+from unittest import mock
+
+from app.database import PAGE_SIZE, DatabaseManager
+
+
+class TestPageSize(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_path = Path(directory.name) / "pages.db"
+
+    def manager(self) -> DatabaseManager:
+        with mock.patch.dict(os.environ, {"SQLITE_DB_PATH": str(self.db_path)}):
+            return DatabaseManager()
+
+    def page_size(self) -> int:
+        with closing(sqlite3.connect(self.db_path)) as connection:
+            return connection.execute("PRAGMA page_size;").fetchone()[0]
+
+    def test_new_file_gets_page_size(self):
+        db = self.manager()
+        db.set_page_size()
+        db.enable_wal_mode()
+        db.execute_update("CREATE TABLE t (x INTEGER)")
+        assert self.page_size() == PAGE_SIZE
+
+    def test_startup_leaves_existing_file_alone(self):
+        with closing(sqlite3.connect(self.db_path)) as connection:
+            connection.execute("PRAGMA page_size = 4096;")
+            connection.execute("CREATE TABLE t (x INTEGER)")
+        self.manager().set_page_size()
+        assert self.page_size() == 4096
+
+    def test_convert_existing_file(self):
+        with closing(sqlite3.connect(self.db_path)) as connection:
+            connection.execute("PRAGMA page_size = 4096;")
+            connection.execute("PRAGMA journal_mode = WAL;")
+            connection.execute("CREATE TABLE t (x INTEGER)")
+            connection.execute("INSERT INTO t VALUES (1), (2)")
+            connection.commit()
+        db = self.manager()
+        db.convert_page_size()
+        assert self.page_size() == PAGE_SIZE
+        assert db.execute_select("SELECT x FROM t ORDER BY x") == [
+            {"x": 1},
+            {"x": 2},
+        ]
+        journal_mode = db.execute_select_one("PRAGMA journal_mode;")
+        assert journal_mode["journal_mode"] == "wal"
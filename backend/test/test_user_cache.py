@@ -0,0 +1,46 @@
+# ruff: noqa: S101, PLR2004
+
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest import mock
+
+from app.services import user_service
+from app_test_case import AppTestCase
+
+
+class TestUserCache(AppTestCase):
+    def get_me(self) -> dict[str, Any]:
+        response = self.client.get("/users/", headers=self.headers)
+        assert response.status_code == 200
+        return response.get_json()
+
+    def test_update_evicts_cached_user(self):
+        assert self.get_me()["name"] == "Test"
+        user_service.update_user(self.user_id, name="Renamed")
+        assert self.get_me()["name"] == "Renamed"
+
+    def test_second_get_does_not_select_user(self):
+        with mock.patch.object(
+            user_service.db_manager,
+            "execute_select_one",
+            wraps=user_service.db_manager.execute_select_one,
+        ) as select_one:
+            first = self.get_me()
+            second = self.get_me()
+        assert select_one.call_count == 1
+        assert second["id"] == first["id"]
+
+    def test_login_refreshes_cached_user(self):
+        last_login = self.get_me()["last_login"]
+        login_time = datetime.now(UTC) + timedelta(minutes=1)
+        assert user_service.update_last_login(self.user_id, login_time)
+        cached = user_service.get_user_cached(self.user_id)
+        assert cached is not None
+        assert cached.last_login != last_login
+        assert cached == user_service.get_user_by_id(self.user_id)
+
+    def test_delete_evicts_cached_user(self):
+        self.get_me()
+        assert user_service.get_user_cached(self.user_id) is not None
+        assert user_service.delete_user(self.user_id)
+        assert user_service.get_user_cached(self.user_id) is None